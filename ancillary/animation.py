@@ -0,0 +1,102 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                # Miscellaneous operating system interfaces
+import numpy as np                       # Import the Numpy package
+import imageio.v2 as imageio             # Python interface to read and write a wide range of image data
+from PIL import Image, ImageChops        # Python imaging library (resize, palettes and frame differences)
+from PIL import GifImagePlugin           # GIF header and frame encoders (one frame at a time)
+#-----------------------------------------------------------------------------------------------------------
+# video codecs (require the imageio-ffmpeg package)
+CODECS = {'.mp4': 'libx264', '.webm': 'libvpx-vp9'}
+#-----------------------------------------------------------------------------------------------------------
+def prepare_frame(path, scale=None):
+
+    # read one frame (RGB), optionally downscaled
+    image = Image.open(path).convert('RGB')
+
+    if scale is not None and scale != 1:
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.LANCZOS)
+
+    return image
+#-----------------------------------------------------------------------------------------------------------
+def shared_palette_image(frames, scale=None, samples=16, size=256):
+
+    # palette image (P mode, 256 colours) built from a montage of small copies of frames sampled along
+    # the whole animation, so the colours that only appear in the later frames are in the palette too
+    step = max(1, len(frames) // samples)
+    thumbs = []
+    for frame in frames[::step]:
+        image = prepare_frame(frame, scale)
+        image.thumbnail((size, size))
+        thumbs.append(image)
+
+    montage = Image.new('RGB', (max(t.width for t in thumbs), sum(t.height for t in thumbs)))
+    top = 0
+    for thumb in thumbs:
+        montage.paste(thumb, (0, top))
+        top += thumb.height
+
+    return montage.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+#-----------------------------------------------------------------------------------------------------------
+def changed_box(previous, image):
+
+    # box of the pixels (palette indices) that changed from the previous frame (None if nothing changed)
+    if previous is None:
+        return (0, 0) + image.size
+
+    return ImageChops.difference(Image.frombytes('L', image.size, previous.tobytes()),
+                                 Image.frombytes('L', image.size, image.tobytes())).getbbox()
+#-----------------------------------------------------------------------------------------------------------
+def write_gif(frames, path, fps=1, scale=None, shared_palette=True):
+
+    # GIF written one frame at a time: only the current and the previous frames are in memory.
+    # with a shared palette, every frame is quantized to it and the file has a single global colour
+    # table and no local ones, so the colours do not change between frames. only the box that changed
+    # from the previous frame is written
+    palette = shared_palette_image(frames, scale) if shared_palette else None
+    duration = int(1000/fps)
+
+    with open(path, 'wb') as f:
+        previous = None
+        for frame in frames:
+            image = prepare_frame(frame, scale)
+            if palette is None:
+                image = image.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+            else:
+                image = image.quantize(palette=palette, dither=Image.Dither.NONE)
+
+            # header (canvas size, global colour table, infinite loop) from the first frame
+            if previous is None:
+                header, _ = GifImagePlugin.getheader(image, image.getpalette(), {'loop': 0, 'duration': duration})
+                f.writelines(header)
+
+            # a frame equal to the previous one is written as a 1 x 1 box, so the timing is kept
+            box = changed_box(previous if palette is not None else None, image) or (0, 0, 1, 1)
+            f.writelines(GifImagePlugin.getdata(image.crop(box), offset=box[:2], duration=duration,
+                                                include_color_table=palette is None))
+            previous = image
+
+        f.write(b';')
+
+    return path
+#-----------------------------------------------------------------------------------------------------------
+def write_animation(frames, path, fps=1, scale=None, shared_palette=True, quality=7):
+
+    # frames: list of image files, in order. the frames are read and converted one at a time
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.gif':
+        return write_gif(frames, path, fps, scale, shared_palette)
+
+    # the video writer encodes each frame as it is appended, so the memory does not depend on the
+    # length of the animation
+    writer = imageio.get_writer(path, mode='I', fps=fps, codec=CODECS[extension], quality=quality,
+                                pixelformat='yuv420p', macro_block_size=2)
+
+    with writer:
+        for frame in frames:
+            writer.append_data(np.asarray(prepare_frame(frame, scale)))
+
+    return path
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,93 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import numpy as np                                 # Import the Numpy package
+import matplotlib                                  # Default resolution of the saved figures (rcParams)
+import cartopy.crs as ccrs                         # Projection of the background image
+from PIL import Image                              # Python imaging library (decode and reduce the image)
+#-----------------------------------------------------------------------------------------------------------
+# global background image (PlateCarree, from 180W to 180E and from 90N to 90S) and size of the tiles
+BACKGROUND = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Nasa_land_ocean_ice_8192.jpg')
+TILE = 512
+#-----------------------------------------------------------------------------------------------------------
+def pyramid_dir(image, cache_dir):
+    return os.path.join(cache_dir, os.path.splitext(os.path.basename(image))[0])
+#-----------------------------------------------------------------------------------------------------------
+def build_pyramid(image=BACKGROUND, cache_dir='background_cache', min_width=1024):
+
+    # decode the image only once and save it as tiles: level 0 is the full resolution, each level
+    # halves the previous one. every level is a compressed .npz file with one array per tile
+    out_dir = pyramid_dir(image, cache_dir)
+    if os.path.exists(os.path.join(out_dir, 'levels.txt')):
+        return out_dir
+
+    os.makedirs(out_dir, exist_ok=True)
+    Image.MAX_IMAGE_PIXELS = None
+    picture = Image.open(image).convert('RGB')
+
+    widths = []
+    while True:
+        data = np.asarray(picture)
+        tiles = {f'r{row}_c{col}': data[row*TILE:(row+1)*TILE, col*TILE:(col+1)*TILE]
+                 for row in range(-(-data.shape[0] // TILE)) for col in range(-(-data.shape[1] // TILE))}
+        np.savez_compressed(os.path.join(out_dir, f'level_{len(widths)}.npz'), **tiles)
+        widths.append(f'{data.shape[1]} {data.shape[0]}')
+        if picture.width // 2 < min_width:
+            break
+        picture = picture.resize((picture.width // 2, picture.height // 2), Image.BOX)
+
+    # the sizes of the levels are written last: they mark the pyramid as complete
+    with open(os.path.join(out_dir, 'levels.txt'), 'w') as f:
+        f.write('\n'.join(widths))
+
+    return out_dir
+#-----------------------------------------------------------------------------------------------------------
+def background_crop(extent, width, image=BACKGROUND, cache_dir='background_cache'):
+
+    # crop of the background for the extent [min. lon, min. lat, max. lon, max. lat], from the coarsest
+    # level that still has at least width pixels across the extent. returns the RGB array and its
+    # extent [min. lon, max. lon, min. lat, max. lat] (for imshow with origin='upper')
+    out_dir = build_pyramid(image, cache_dir)
+    with open(os.path.join(out_dir, 'levels.txt')) as f:
+        sizes = [tuple(int(v) for v in line.split()) for line in f.read().splitlines()]
+
+    level = 0
+    for i, (w, h) in enumerate(sizes):
+        if w * (extent[2] - extent[0]) / 360 >= width:
+            level = i
+    w, h = sizes[level]
+    res = 360 / w
+
+    # pixels of the extent at this level
+    col_a = max(int(np.floor((extent[0] + 180) / res)), 0)
+    col_b = min(int(np.ceil((extent[2] + 180) / res)), w)
+    row_a = max(int(np.floor((90 - extent[3]) / res)), 0)
+    row_b = min(int(np.ceil((90 - extent[1]) / res)), h)
+
+    # read only the tiles that intersect the extent
+    crop = np.zeros((row_b - row_a, col_b - col_a, 3), dtype=np.uint8)
+    with np.load(os.path.join(out_dir, f'level_{level}.npz')) as tiles:
+        for row in range(row_a // TILE, (row_b - 1) // TILE + 1):
+            for col in range(col_a // TILE, (col_b - 1) // TILE + 1):
+                tile = tiles[f'r{row}_c{col}']
+                r0, c0 = row * TILE, col * TILE
+                ra, rb = max(row_a, r0), min(row_b, r0 + tile.shape[0])
+                ca, cb = max(col_a, c0), min(col_b, c0 + tile.shape[1])
+                crop[ra - row_a:rb - row_a, ca - col_a:cb - col_a] = tile[ra - r0:rb - r0, ca - c0:cb - c0]
+
+    return crop, [-180 + col_a * res, -180 + col_b * res, 90 - row_b * res, 90 - row_a * res]
+#-----------------------------------------------------------------------------------------------------------
+def add_background(ax, extent, image=BACKGROUND, cache_dir='background_cache', dpi=None, **kwargs):
+
+    # draw the crop of the background needed by the map, at the resolution of the saved image: width of the
+    # axes (not of the whole figure) in pixels at the savefig dpi (dpi argument, or rcParams['savefig.dpi'])
+    if dpi is None:
+        dpi = matplotlib.rcParams['savefig.dpi']
+    if dpi == 'figure':
+        dpi = ax.figure.dpi
+    ax.apply_aspect()
+    width = ax.get_window_extent().width / ax.figure.dpi * dpi
+    crop, crop_extent = background_crop(extent, width, image, cache_dir)
+
+    return ax.imshow(crop, origin='upper', transform=ccrs.PlateCarree(), extent=crop_extent, **kwargs)
+#-----------------------------------------------------------------------------------------------------------
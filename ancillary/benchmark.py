@@ -0,0 +1,318 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                                   # Miscellaneous operating system interfaces
+import glob                                                 # Unix style pathname pattern expansion
+import sys                                                  # System-specific parameters and functions
+import json                                                 # Read / write the baseline
+import time                                                 # Time access and conversions
+import argparse                                             # Command line options
+from datetime import datetime                               # Basic date and time types
+import matplotlib                                           # Comprehensive library for creating visualizations in Python
+matplotlib.use('Agg')                                       # Non-interactive backend (only files are written)
+import numpy as np                                          # Import the Numpy package
+from netCDF4 import Dataset                                 # Read / write NetCDF4 files
+from concurrent.futures import ProcessPoolExecutor          # One fresh process per run (clean peak RSS)
+from readers import read_region, read_img_region            # Regional readers
+from readers import read_zip_region, ndvi_date              # NDVI windows and dates of the zip archives
+from readers import AVHRR_GRID                              # Grid of the .img files
+from timeseries import netcdf_time                          # Nominal time of the LSA SAF NetCDF files
+from masks import region_mask                               # Cached rasterized masks of the shapefile regions
+from zonal import zonal_table, write_zonal_table            # Statistics per state / region
+from utilities import cpt_table                             # Colormaps of the CPT color tables
+from colorize import NDVI_CODING, build_lut, colorize       # Lookup-table colorization
+from render import MapRenderer                              # Map with the static layers drawn once
+from animation import write_animation                       # Streaming GIF / MP4 / WebM writer
+from fixtures import generate                               # Synthetic input files
+try:
+    import resource                                         # Peak resident set size (Unix only)
+except ImportError:
+    resource = None
+#-----------------------------------------------------------------------------------------------------------
+# mtg modules (chunks, areas, resampling), imported by the FCI pipeline only (satpy is not needed by the others)
+MTG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'mtg')
+#-----------------------------------------------------------------------------------------------------------
+class Stages:
+
+    # wall time and memory of each stage of a pipeline:
+    # - peak_rss_mb: peak resident memory during the stage. the peak of the process is reset when the stage
+    #   starts (Linux only, None elsewhere), so it includes the memory still held by the previous stages
+    # - process_peak_rss_mb: cumulative peak of the process, from the start of the pipeline to the end of the
+    #   stage (ru_maxrss is reset with the peak, so the maximum of the stage peaks is kept)
+    def __init__(self):
+        self.results = {}
+        self.process_peak = 0
+
+    def __call__(self, name):
+        self.name = name
+        return self
+
+    def __enter__(self):
+        self.reset = reset_peak_rss()
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        stage_peak = stage_peak_rss_mb() if self.reset else None
+        self.process_peak = max(self.process_peak, stage_peak or 0, peak_rss_mb() or 0)
+        self.results[self.name] = {'seconds': seconds, 'peak_rss_mb': stage_peak, 'process_peak_rss_mb': self.process_peak}
+#-----------------------------------------------------------------------------------------------------------
+def peak_rss_mb():
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return rss / 1024**2 if sys.platform == 'darwin' else rss / 1024
+#-----------------------------------------------------------------------------------------------------------
+def reset_peak_rss():
+
+    # reset the peak resident set size of the process to the current one (Linux 4.0+). False if not supported
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+
+    return True
+#-----------------------------------------------------------------------------------------------------------
+def stage_peak_rss_mb():
+
+    # peak resident set size since the last reset (VmHWM, in kilobytes)
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+
+    return None
+#-----------------------------------------------------------------------------------------------------------
+def lst_pipeline(stages, path, options):
+
+    # MSG-Disk NetCDF product (scripts 04 - 11 and 17 - 25): read, subset, mask, draw vectors, savefig
+    with stages('read'):
+        file = Dataset(path)
+        data, lats, lons = read_region(file, options['variable'], options['extent'])
+        data = np.ma.filled(data.astype(np.float32), np.nan)
+
+    with stages('mask'):
+        mask, names = region_mask(options['regions'], lats, lons)
+        data = np.where(mask == names.index('NE'), data, np.nan)
+
+    with stages('draw'):
+        renderer = MapRenderer(options['extent'], data, 'jet', -10, 35, 'LST (°C)', origin='upper', shapefile=options['shapefile'])
+
+    with stages('savefig'):
+        renderer.render(data, 'benchmark', os.path.join(options['out_dir'], 'benchmark_lst.png'), dpi=options['dpi'])
+
+    renderer.close()
+    file.close()
+#-----------------------------------------------------------------------------------------------------------
+def ndvi_pipeline(stages, path, options):
+
+    # METOP/AVHRR 10-day NDVI .img files (script 12): read the window, colorize the counts, draw, savefig
+    with stages('read'):
+        data, lats, lons = read_img_region(path, options['extent'])
+
+    with stages('read full'):
+        counts = np.array(np.memmap(path, dtype='uint8', mode='r', shape=(AVHRR_GRID['nrow'], AVHRR_GRID['ncol'])))
+
+    with stages('colorize'):
+        lut = build_lut(matplotlib.colormaps['RdYlGn'], -0.1, 0.9, **NDVI_CODING)
+        colorize(counts, lut)  # full resolution quicklook
+
+    with stages('draw'):
+        renderer = MapRenderer(options['extent'], data, 'RdYlGn', -0.1, 0.9, 'NDVI', shapefile=options['shapefile'])
+
+    with stages('savefig'):
+        renderer.render(data, 'benchmark', os.path.join(options['out_dir'], 'benchmark_ndvi.png'), dpi=options['dpi'])
+
+    renderer.close()
+#-----------------------------------------------------------------------------------------------------------
+def animation_pipeline(stages, path, options):
+
+    # METOP/AVHRR 10-day NDVI zip archives (scripts 13 - 15): windows from the archives, frames, GIF
+    files = sorted(glob.glob(path), key=ndvi_date)
+
+    with stages('read'):
+        windows = [read_zip_region(file, options['extent'])[0] for file in files]
+
+    with stages('draw'):
+        renderer = MapRenderer(options['extent'], windows[0], 'RdYlGn', -0.1, 0.9, 'NDVI', shapefile=options['shapefile'])
+
+    with stages('frames'):
+        frames = []
+        for file, data in zip(files, windows):
+            frames.append(os.path.join(options['out_dir'], f'benchmark_ndvi_{ndvi_date(file):%Y%m%d}.png'))
+            renderer.render(data, ndvi_date(file).strftime('%Y-%m-%d'), frames[-1], dpi=options['dpi'])
+        renderer.close()
+
+    with stages('animation'):
+        write_animation(frames, os.path.join(options['out_dir'], 'benchmark_ndvi.gif'), fps=1)
+#-----------------------------------------------------------------------------------------------------------
+def zonal_pipeline(stages, path, options):
+
+    # MSG-Disk NetCDF product with a CPT color table and statistics per state (scripts 06 - 09):
+    # read, parse the table, state mask, zonal table, draw, savefig
+    with stages('read'):
+        file = Dataset(path)
+        data, lats, lons = read_region(file, options['variable'], options['extent'])
+        data = np.ma.filled(data.astype(np.float32), np.nan)
+        time = netcdf_time(file)
+        file.close()
+
+    with stages('cpt'):
+        cmap = cpt_table(options['cpt'])
+
+    with stages('mask'):
+        labels, names = region_mask(options['shapefile'], lats, lons)
+
+    with stages('zonal'):
+        write_zonal_table(zonal_table([(time, data)], labels, names), os.path.join(options['out_dir'], 'benchmark_zonal.csv'))
+
+    with stages('draw'):
+        renderer = MapRenderer(options['extent'], data, cmap, -10, 35, 'LST (°C)', origin='upper', shapefile=options['shapefile'])
+
+    with stages('savefig'):
+        renderer.render(data, 'benchmark', os.path.join(options['out_dir'], 'benchmark_zonal.png'), dpi=options['dpi'])
+
+    renderer.close()
+#-----------------------------------------------------------------------------------------------------------
+def fci_pipeline(stages, path, options):
+
+    # FCI L1C chunk files (mtg scripts 03 - 05 and batch.py): select the chunks of the area, load the channel,
+    # read it, resample it to the area (neighbour indices cached on disk), draw, savefig
+    sys.path.append(MTG_DIR)
+    from satpy import Scene
+    from areas import get_area, area_extent
+    from chunks import select_chunk_files
+    from resampling import resample_cached
+
+    area = get_area(options['area'])
+    with stages('chunks'):
+        filenames = select_chunk_files(glob.glob(path), area)
+
+    with stages('load'):
+        scn = Scene(filenames=filenames, reader='fci_l1c_nc')
+        scn.load([options['channel']], upper_right_corner='NE')
+
+    with stages('read'):
+        scn[options['channel']] = scn[options['channel']].persist()
+
+    with stages('resample'):
+        local = resample_cached(scn, area)
+        data = local[options['channel']].values
+
+    extent = list(area_extent(options['area']))
+    with stages('draw'):
+        renderer = MapRenderer(extent, data, 'gray_r', 200, 310, 'BT (K)', origin='upper', shapefile=options['shapefile'])
+
+    with stages('savefig'):
+        renderer.render(data, 'benchmark', os.path.join(options['out_dir'], 'benchmark_fci.png'), dpi=options['dpi'])
+
+    renderer.close()
+#-----------------------------------------------------------------------------------------------------------
+# pipelines: function, fixture file (or pattern) and options
+PIPELINES = {
+    'lst':       (lst_pipeline, 'NETCDF4_LSASAF_MSG_DLST-MAX10D_MSG-Disk_202307112345.nc',
+                  {'variable': 'LST_MAX', 'extent': [-50.0, -20.0, -33.0, 0.0]}),
+    'ndvi':      (ndvi_pipeline, 'METOP_AVHRR_20230711_S10_AMs_NDV.img',
+                  {'extent': [-75.0, -37.0, -33.0, 8.0]}),
+    'animation': (animation_pipeline, 'METOP_AVHRR_*_S10_AMs_V200.zip',
+                  {'extent': [-50.0, -20.0, -33.0, 0.0]}),
+    'zonal':     (zonal_pipeline, 'NETCDF4_LSASAF_MSG_DLST-MAX10D_MSG-Disk_202307112345.nc',
+                  {'variable': 'LST_MAX', 'extent': [-75.0, -37.0, -33.0, 8.0], 'cpt': 'IR4AVHRR6.cpt'}),
+    'fci':       (fci_pipeline, '*FCI-1C-RRAD-FDHSI-FD--CHK-BODY-*_C_0073_*.nc',
+                  {'area': 'northeast', 'channel': 'ir_105'}),
+}
+#-----------------------------------------------------------------------------------------------------------
+def run_pipeline(name, fixture_dir, options):
+
+    # runs in a new process: the peak RSS belongs to this pipeline only
+    function, file_name, pipeline_options = PIPELINES[name]
+    stages = Stages()
+    function(stages, os.path.join(fixture_dir, file_name), {**pipeline_options, **options})
+
+    return stages.results
+#-----------------------------------------------------------------------------------------------------------
+def run_benchmarks(fixture_dir, names=None, repeat=3, **options):
+
+    # best time of each stage over the repetitions (the first run also fills the mask and geometry caches)
+    options = {'regions': 'regioes_2010.shp', 'shapefile': 'BR_UF_2022.shp', 'out_dir': '.', 'dpi': 100, **options}
+    results = {}
+    for name in names or PIPELINES:
+        runs = []
+        for i in range(repeat):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                runs.append(executor.submit(run_pipeline, name, fixture_dir, options).result())
+        results[name] = {stage: {'seconds': min(run[stage]['seconds'] for run in runs),
+                                 'peak_rss_mb': runs[-1][stage]['peak_rss_mb'],
+                                 'process_peak_rss_mb': runs[-1][stage]['process_peak_rss_mb']} for stage in runs[0]}
+        results[name]['total'] = {'seconds': sum(stage['seconds'] for stage in results[name].values()),
+                                  'peak_rss_mb': max((stage['peak_rss_mb'] or 0) for stage in results[name].values()),
+                                  'process_peak_rss_mb': max((stage['process_peak_rss_mb'] or 0) for stage in results[name].values())}
+
+    return results
+#-----------------------------------------------------------------------------------------------------------
+def compare(results, baseline, tolerance=0.2, min_seconds=0.05):
+
+    # stages slower than the baseline by more than the tolerance (and by more than min_seconds)
+    regressions = []
+    for name, stages in results.items():
+        for stage, result in stages.items():
+            reference = baseline.get(name, {}).get(stage)
+            if reference is None:
+                continue
+            if result['seconds'] > reference['seconds'] * (1 + tolerance) and result['seconds'] - reference['seconds'] > min_seconds:
+                regressions.append((name, stage, reference['seconds'], result['seconds']))
+
+    return regressions
+#-----------------------------------------------------------------------------------------------------------
+def print_results(results, baseline):
+
+    # stage peak: peak RSS during the stage; process peak: cumulative peak RSS of the pipeline process
+    print(f'{"pipeline":9} {"stage":10} {"time":>11} {"stage peak":>12} {"process peak":>12} {"change":>9}')
+    for name, stages in results.items():
+        for stage, result in stages.items():
+            reference = baseline.get(name, {}).get(stage, {}).get('seconds')
+            change = f'{100 * (result["seconds"] / reference - 1):+7.1f} %' if reference else ''
+            stage_peak = f'{result["peak_rss_mb"]:9.1f} MB' if result['peak_rss_mb'] is not None else f'{"n/a":>12}'
+            print(f'{name:9} {stage:10} {result["seconds"]:9.3f} s {stage_peak} {result["process_peak_rss_mb"] or 0:9.1f} MB {change:>9}')
+#-----------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Per-stage timings and peak RSS (per stage and cumulative) of the product pipelines')
+    parser.add_argument('--fixtures', default='fixtures', help='folder with the input files')
+    parser.add_argument('--generate', action='store_true', help='write the missing synthetic input files first')
+    parser.add_argument('--baseline', default='benchmark_baseline.json', help='baseline JSON file')
+    parser.add_argument('--update', action='store_true', help='save the results as the new baseline')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('pipelines', nargs='*', help=f'pipelines to run (default: all of {list(PIPELINES)})')
+    args = parser.parse_args()
+
+    # synthetic files with the real grids (see fixtures.py)
+    if args.generate:
+        generate(['DLST'], datetime(2023, 7, 11), datetime(2023, 7, 11, 23, 59), args.fixtures)
+        generate(['ENDVI10'], datetime(2023, 7, 1), datetime(2023, 7, 21), args.fixtures, ENDVI10={'img': True})
+        if not glob.glob(os.path.join(args.fixtures, PIPELINES['fci'][1])):
+            generate(['FCI'], datetime(2023, 7, 11, 12, 0), datetime(2023, 7, 11, 12, 0), args.fixtures)
+
+    results = run_benchmarks(args.fixtures, args.pipelines, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    if args.update:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, stage, before, after in regressions:
+        print(f'regression: {name} / {stage}: {before:.3f} s -> {after:.3f} s')
+
+    sys.exit(1 if regressions and not args.update else 0)
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,174 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import time                                        # Time access and conversions
+import glob                                        # Unix style pathname pattern expansion
+import fcntl                                       # File locks between threads and processes
+import sqlite3                                     # Index of the cached files
+import threading                                   # Lock of the index between download threads
+import requests                                    # HTTP library for Python (network errors)
+from contextlib import contextmanager             # Lock files as context managers
+from concurrent.futures import ThreadPoolExecutor  # Bounded pool of worker threads
+#-----------------------------------------------------------------------------------------------------------
+class ProductCache:
+
+    # local cache of downloaded SAF / H SAF files, limited to a byte budget (least recently used files are removed first)
+    def __init__(self, cache_dir, max_bytes=20 * 1024**3, retries=10):
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.retries = retries
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # index: product, nominal time, size and last access of every file. the index may be shared by several
+        # processes (e.g. overlapping cron runs): the writers wait for each other (busy timeout, WAL journal)
+        self.db = sqlite3.connect(os.path.join(cache_dir, 'cache_index.sqlite'), timeout=30, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.execute('PRAGMA journal_mode=WAL')
+        self.execute('CREATE TABLE IF NOT EXISTS files (name TEXT PRIMARY KEY, product TEXT, time TEXT, size INTEGER, last_access REAL)')
+
+        # lock files of the fetches (one per file name, removed when the fetch is over): a file is fetched by
+        # a single thread or process, the others wait for it
+        self.lock_dir = os.path.join(cache_dir, 'locks')
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+    def execute(self, sql, params=()):
+
+        # run and commit a statement, trying again while another process holds the index ("database is locked")
+        for attempt in range(self.retries):
+            try:
+                with self.lock:
+                    rows = self.db.execute(sql, params).fetchall()
+                    self.db.commit()
+                return rows
+            except sqlite3.OperationalError as error:
+                if ('locked' not in str(error) and 'busy' not in str(error)) or attempt == self.retries - 1:
+                    raise
+                time.sleep(0.1 * 2**attempt)
+
+    @contextmanager
+    def file_lock(self, name, blocking=True):
+
+        # exclusive lock of a file name, between threads and processes. yields False if the lock is held and
+        # blocking is False. the lock file is removed on release: a waiter that locked the removed file
+        # opens the new one and locks it again
+        path = os.path.join(self.lock_dir, name + '.lock')
+        while True:
+            lock_file = open(path, 'a')
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                lock_file.close()
+                yield False
+                return
+            try:
+                if os.fstat(lock_file.fileno()).st_ino == os.stat(path).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            lock_file.close()
+
+        try:
+            yield True
+        finally:
+            os.remove(path)
+            lock_file.close()
+
+    def path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def touch(self, names):
+        now = time.time()
+        for name in names:
+            self.execute('UPDATE files SET last_access = ? WHERE name = ?', (now, name))
+
+    def register(self, product_file, name):
+        size = os.path.getsize(self.path(name))
+        self.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)',
+                     (name, product_file['product'], product_file['time'].isoformat(), size, time.time()))
+
+    def cached(self, name):
+        rows = self.execute('SELECT 1 FROM files WHERE name = ?', (name,))
+        return len(rows) > 0 and os.path.exists(self.path(name))
+
+    def files(self, pattern):
+
+        # cached files matching a pattern (e.g. 'METOP_AVHRR_*_S10_AMs_V200.zip'), for the scripts that read
+        # them: the files are marked as used, so the eviction removes the least recently used (not downloaded) ones
+        paths = sorted(glob.glob(self.path(pattern)))
+        self.touch([os.path.basename(path) for path in paths])
+
+        return paths
+
+    def evict(self, keep=()):
+
+        # remove the least recently used files (and their ETag files) until the cache fits in the byte budget.
+        # the files to keep (e.g. the files of the current batch) and the files being fetched by another
+        # thread or process (lock held) are not removed
+        total = self.execute('SELECT COALESCE(SUM(size), 0) FROM files')[0][0]
+        for name, size in self.execute('SELECT name, size FROM files ORDER BY last_access'):
+            if total <= self.max_bytes:
+                break
+            if name in keep:
+                continue
+            with self.file_lock(name, blocking=False) as locked:
+                if not locked:
+                    continue
+                for path in (self.path(name), self.path(name) + '.etag'):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self.execute('DELETE FROM files WHERE name = ?', (name,))
+                total = total - size
+
+        if total > self.max_bytes:
+            print(f'Cache above the byte budget: {total / 1024**2:.1f} MB of {self.max_bytes / 1024**2:.1f} MB (files in use)')
+
+    def fetch(self, product_file, fetch):
+
+        # local path of a file, fetched if it is not in the cache (None if it is not found). no eviction
+        name = os.path.basename(product_file['local_path'])
+        if self.cached(name):
+            self.touch([name])
+            return self.path(name)
+
+        # if another thread or process is fetching the same file, wait until it is done
+        with self.file_lock(name):
+            if not os.path.exists(self.path(name)):
+                fetch(product_file['url'], self.path(name))
+            if os.path.exists(self.path(name)):
+                self.register(product_file, name)
+
+        return self.path(name) if os.path.exists(self.path(name)) else None
+
+    def get(self, product_file, fetch):
+
+        # product_file: one of the dictionaries of catalog.product_files
+        # fetch: function (url, local path) that downloads the file
+        path = self.fetch(product_file, fetch)
+        if path is not None:
+            self.evict(keep=(os.path.basename(path),))
+
+        return path if path is not None and os.path.exists(path) else None
+
+    def get_many(self, product_files, fetch, max_workers=4):
+
+        # fetch the missing files in parallel. a failed file (network or disk error) is reported and does not
+        # stop the others. the eviction runs once, after the batch, and keeps every file of the batch.
+        # returns the local paths of the files in the cache
+        def run(product_file):
+            name = os.path.basename(product_file['local_path'])
+            try:
+                path = self.fetch(product_file, fetch)
+                status = 'ok' if path is not None else 'not found'
+            except (requests.RequestException, OSError, sqlite3.Error) as error:
+                path, status = None, f'error ({error})'
+            print(f'{name}: {status}')
+            return path
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            paths = [path for path in executor.map(run, product_files) if path is not None]
+
+        self.evict(keep={os.path.basename(path) for path in paths})
+
+        return [path for path in paths if os.path.exists(path)]
+#-----------------------------------------------------------------------------------------------------------
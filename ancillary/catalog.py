@@ -0,0 +1,117 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                # Miscellaneous operating system interfaces
+from datetime import datetime, timedelta # Basic date and time types
+#-----------------------------------------------------------------------------------------------------------
+# Servers
+LSASAF_URL = 'https://datalsasaf.lsasvcs.ipma.pt'
+HSAF_URL = 'ftp://ftphsaf.meteoam.it'
+
+# Products used in the scripts (see samples/download_links.txt)
+# cadence: '15min', '30min', 'hourly', 'daily' or 'dekad' (10-day, on the given days of the month)
+# path and file: strftime templates of the server folder and of the file name
+PRODUCTS = {
+    'DLST':      {'server': LSASAF_URL, 'cadence': 'dekad', 'days': (1, 11, 21), 'hour': 23, 'minute': 45,
+                  'path': '/PRODUCTS/MSG/DLST/NETCDF/%Y/%m/%d/',
+                  'file': 'NETCDF4_LSASAF_MSG_DLST-MAX10D_MSG-Disk_%Y%m%d%H%M.nc',
+                  'variables': ['LST_MAX']},
+    'EDLST':     {'server': LSASAF_URL, 'cadence': 'daily',
+                  'path': '/PRODUCTS/EPS/EDLST/NETCDF/%Y/%m/%d/',
+                  'file': 'NETCDF4_LSASAF_M01-AVHR_EDLST-DAY_GLOBE_%Y%m%d%H%M.nc',
+                  'variables': ['LST-day', 'aquisition_time-day']},
+    'ENDVI10':   {'server': LSASAF_URL, 'cadence': 'dekad', 'days': (1, 11, 21),
+                  'path': '/PRODUCTS/EPS/ENDVI10/ENVI/%Y/%m/%d/',
+                  'file': 'METOP_AVHRR_%Y%m%d_S10_AMs_V200.zip',
+                  'variables': ['NDV', 'STM']},
+    'FRP-PIXEL': {'server': LSASAF_URL, 'cadence': '15min',
+                  'path': '/PRODUCTS/MSG/FRP-PIXEL/HDF5/%Y/%m/%d/',
+                  'file': 'HDF5_LSASAF_MSG_FRP-PIXEL-ListProduct_MSG-Disk_%Y%m%d%H%M',
+                  'variables': ['LATITUDE', 'LONGITUDE', 'FRP']},
+    'ETAL':      {'server': LSASAF_URL, 'cadence': 'dekad', 'days': (5, 15, 25),
+                  'path': '/PRODUCTS/EPS/ETAL/NETCDF/%Y/%m/%d/',
+                  'file': 'NETCDF4_LSASAF_M01-AVHR_ETAL_GLOBE_%Y%m%d%H%M.nc',
+                  'variables': ['AL-BB-BH']},
+    'ETFAPAR':   {'server': LSASAF_URL, 'cadence': 'dekad', 'days': (5, 15, 25),
+                  'path': '/PRODUCTS/EPS/ETFAPAR/NETCDF/%Y/%m/%d/',
+                  'file': 'NETCDF4_LSASAF_M01-AVHR_ETFAPAR_GLOBE_%Y%m%d%H%M.nc',
+                  'variables': ['FAPAR']},
+    'ETFVC':     {'server': LSASAF_URL, 'cadence': 'dekad', 'days': (5, 15, 25),
+                  'path': '/PRODUCTS/EPS/ETFVC/NETCDF/%Y/%m/%d/',
+                  'file': 'NETCDF4_LSASAF_M01-AVHR_ETFVC_GLOBE_%Y%m%d%H%M.nc',
+                  'variables': ['FVC']},
+    'ETLAI':     {'server': LSASAF_URL, 'cadence': 'dekad', 'days': (5, 15, 25),
+                  'path': '/PRODUCTS/EPS/ETLAI/NETCDF/%Y/%m/%d/',
+                  'file': 'NETCDF4_LSASAF_M01-AVHR_ETLAI_GLOBE_%Y%m%d%H%M.nc',
+                  'variables': ['LAI']},
+    'METv3':     {'server': LSASAF_URL, 'cadence': '30min',
+                  'path': '/PRODUCTS/MSG/METv3/NETCDF/%Y/%m/%d/',
+                  'file': 'NETCDF4_LSASAF_MSG_ETv3_MSG-Disk_%Y%m%d%H%M.nc',
+                  'variables': ['ET']},
+    'MDSSFTD':   {'server': LSASAF_URL, 'cadence': '15min',
+                  'path': '/PRODUCTS/MSG/MDSSFTD/NETCDF/%Y/%m/%d/',
+                  'file': 'NETCDF4_LSASAF_MSG_MDSSFTD_MSG-Disk_%Y%m%d%H%M.nc',
+                  'variables': ['DSSF_TOT']},
+    'MDIDSSF':   {'server': LSASAF_URL, 'cadence': 'daily',
+                  'path': '/PRODUCTS/MSG/MDIDSSF/NETCDF/%Y/%m/%d/',
+                  'file': 'NETCDF4_LSASAF_MSG_DIDSSF_MSG-Disk_%Y%m%d%H%M.nc',
+                  'variables': ['DSSF']},
+    'h26':       {'server': HSAF_URL, 'cadence': 'daily',
+                  'path': '/h26/h26_cur_mon_nc/',
+                  'file': 'h26_%Y%m%d%H_R01.nc',
+                  'variables': ['var42']},
+    'h64':       {'server': HSAF_URL, 'cadence': 'daily',
+                  'path': '/h64/h64_cur_mon_data/',
+                  'file': 'h64_%Y%m%d_%H%M_24_hea.nc.gz',
+                  'variables': ['acc_rr']},
+}
+
+# time step of the regular cadences
+STEPS = {'15min': timedelta(minutes=15), '30min': timedelta(minutes=30), 'hourly': timedelta(hours=1), 'daily': timedelta(days=1)}
+#-----------------------------------------------------------------------------------------------------------
+def product_times(product, start, end):
+
+    # every nominal time of a product between two datetimes (both included)
+    info = PRODUCTS[product]
+    times = []
+
+    # 10-day products: one file on each of the given days of the month
+    if info['cadence'] == 'dekad':
+        month = datetime(start.year, start.month, 1)
+        while month <= end:
+            for day in info['days']:
+                time = month.replace(day=day, hour=info.get('hour', 0), minute=info.get('minute', 0))
+                if start <= time <= end:
+                    times.append(time)
+            month = (month + timedelta(days=32)).replace(day=1)
+        return times
+
+    # regular cadences, aligned to the start of the day
+    step = STEPS[info['cadence']]
+    time = datetime(start.year, start.month, start.day, info.get('hour', 0), info.get('minute', 0))
+    while time <= end:
+        if time >= start:
+            times.append(time)
+        time = time + step
+
+    return times
+#-----------------------------------------------------------------------------------------------------------
+def product_files(product, start, end, local_dir='../samples'):
+
+    # plan every expected file of a product: time, url, local path and variable names
+    info = PRODUCTS[product]
+    files = []
+    for time in product_times(product, start, end):
+        file_name = time.strftime(info['file'])
+        files.append({'product': product,
+                      'time': time,
+                      'url': info['server'] + time.strftime(info['path']) + file_name,
+                      'local_path': os.path.join(local_dir, file_name),
+                      'variables': info['variables']})
+
+    return files
+#-----------------------------------------------------------------------------------------------------------
+def download_jobs(files):
+
+    # (url, local path) pairs for the HTTP downloader (the H SAF products are on a FTP server)
+    return [(f['url'], f['local_path']) for f in files if f['url'].startswith('http')]
+#-----------------------------------------------------------------------------------------------------------
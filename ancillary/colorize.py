@@ -0,0 +1,67 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import numpy as np                                           # Import the Numpy package
+from PIL import Image                                        # Python imaging library (save the RGBA images)
+from matplotlib.colors import to_rgba                        # Convert the fill color to RGBA
+from readers import AVHRR_GRID, img_window, read_zip_window  # Raw counts of the METOP/AVHRR archives
+#-----------------------------------------------------------------------------------------------------------
+# scale, offset and valid counts of the METOP/AVHRR 10-day NDVI (counts above 250 are missing values)
+NDVI_CODING = {'scale': 0.004, 'offset': -0.08, 'valid_range': (0, 250), 'dtype': 'uint8'}
+#-----------------------------------------------------------------------------------------------------------
+def lut_counts(dtype):
+
+    # every possible count of the data type, in the order of the unsigned index used by colorize
+    if np.dtype(dtype).itemsize == 1:
+        return np.arange(256, dtype=np.uint8).view(dtype)
+
+    return np.arange(65536, dtype=np.uint16).view(dtype)
+#-----------------------------------------------------------------------------------------------------------
+def build_lut(cmap, vmin, vmax, scale=1.0, offset=0.0, valid_range=None, dtype='uint8', bad=None):
+
+    # RGBA color (uint8) of each possible count: 256 entries for 8 bit data, 65536 for 16 bit data.
+    # values below vmin / above vmax get the under / over colors of the colormap, counts outside the
+    # valid range get the bad color
+    counts = lut_counts(dtype)
+    values = offset + scale * counts.astype(np.float64)
+    lut = cmap((values - vmin) / (vmax - vmin), bytes=True)
+
+    if valid_range is not None:
+        invalid = (counts < valid_range[0]) | (counts > valid_range[1])
+        lut[invalid] = np.round(np.array(to_rgba(bad) if bad is not None else cmap.get_bad()) * 255)
+
+    return lut
+#-----------------------------------------------------------------------------------------------------------
+def colorize(counts, lut, mask=None, fill=None):
+
+    # raw counts to RGBA with a single lookup (no float arrays). the masked pixels (e.g. clouds) are
+    # replaced by the fill count before the lookup, or made transparent when there is no fill count
+    if mask is not None and fill is not None:
+        counts = np.where(mask, np.array(fill, dtype=counts.dtype), counts)
+
+    index = counts.view(np.uint8 if counts.dtype.itemsize == 1 else np.uint16)
+    rgba = np.take(lut, index, axis=0)
+
+    if mask is not None and fill is None:
+        rgba[np.broadcast_to(mask, counts.shape)] = 0
+
+    return rgba
+#-----------------------------------------------------------------------------------------------------------
+def save_rgba(rgba, path):
+
+    # save the colored image (first row = north) as it is, e.g. for quicklooks and web tiles
+    Image.fromarray(rgba, 'RGBA').save(path)
+
+    return path
+#-----------------------------------------------------------------------------------------------------------
+def ndvi_quicklook(path, extent, lut, out_path, clouds=True, grid=AVHRR_GRID):
+
+    # quicklook of the region straight from the counts of a METOP_AVHRR_*_S10_AMs_V200.zip archive
+    rows, cols = img_window(extent, grid)
+    counts = read_zip_window(path, '_NDV.img', rows, cols, grid)
+
+    mask = None
+    if clouds:
+        mask = ((read_zip_window(path, '_STM.img', rows, cols, grid) >> 1) & 1) == 1
+
+    return save_rgba(colorize(counts, lut, mask, fill=255), out_path)
+#-----------------------------------------------------------------------------------------------------------
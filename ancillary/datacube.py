@@ -0,0 +1,125 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                                         # Miscellaneous operating system interfaces
+import numpy as np                                                # Import the Numpy package
+from netCDF4 import Dataset, date2num, num2date                   # Read / write NetCDF4 files
+from readers import read_img_region, read_zip_region, ndvi_date   # Regional NDVI windows and dates of the files
+from readers import read_region                                   # Regional window of the NetCDF files
+from timeseries import netcdf_time                                # Nominal time of the LSA SAF NetCDF files
+#-----------------------------------------------------------------------------------------------------------
+TIME_UNITS = 'days since 1970-01-01 00:00:00'
+#-----------------------------------------------------------------------------------------------------------
+def create_cube(path, variable, lats, lons, units='', chunks=(12, 128, 128)):
+
+    # (time, lat, lon) cube with an unlimited time dimension. the chunks hold a few dates of a small
+    # area, so maps and time series both read a small number of chunks
+    cube = Dataset(path, 'w', format='NETCDF4')
+    cube.createDimension('time', None)
+    cube.createDimension('lat', len(lats))
+    cube.createDimension('lon', len(lons))
+
+    time = cube.createVariable('time', 'f8', ('time',))
+    time.units = TIME_UNITS
+    cube.createVariable('lat', 'f4', ('lat',))[:] = lats
+    cube.createVariable('lon', 'f4', ('lon',))[:] = lons
+
+    chunks = (chunks[0], min(chunks[1], len(lats)), min(chunks[2], len(lons)))
+    var = cube.createVariable(variable, 'f4', ('time', 'lat', 'lon'), zlib=True, complevel=4, shuffle=True,
+                              chunksizes=chunks, fill_value=np.float32(np.nan))
+    var.units = units
+
+    return cube
+#-----------------------------------------------------------------------------------------------------------
+def cube_times(cube):
+
+    # dates already in the cube
+    time = cube.variables['time']
+    if len(time) == 0:
+        return []
+
+    return list(num2date(time[:], TIME_UNITS, only_use_cftime_datetimes=False, only_use_python_datetimes=True))
+#-----------------------------------------------------------------------------------------------------------
+def check_grid(cube, lats, lons, name):
+
+    # the grid of a new date must be the grid of the cube (same window of the same product)
+    cube_lats = cube.variables['lat'][:]
+    cube_lons = cube.variables['lon'][:]
+    if cube_lats.shape != np.shape(lats) or cube_lons.shape != np.shape(lons) or \
+       not np.allclose(cube_lats, lats, atol=1e-4) or not np.allclose(cube_lons, lons, atol=1e-4):
+        raise ValueError(f'{name}: grid ({len(lats)} x {len(lons)}, lat {lats[0]:.4f} to {lats[-1]:.4f}, '
+                         f'lon {lons[0]:.4f} to {lons[-1]:.4f}) does not match the grid of the cube '
+                         f'({len(cube_lats)} x {len(cube_lons)}, lat {cube_lats[0]:.4f} to {cube_lats[-1]:.4f}, '
+                         f'lon {cube_lons[0]:.4f} to {cube_lons[-1]:.4f})')
+#-----------------------------------------------------------------------------------------------------------
+def append_to_cube(cube, variable, date, data):
+
+    # write a new date in its sorted position of the time dimension. a date later than the last one is
+    # written at the end; an older date (e.g. a missed dekad added later) moves the newer dates one step
+    time = cube.variables['time']
+    var = cube.variables[variable]
+    value = date2num(date, TIME_UNITS)
+    index = int(np.searchsorted(time[:], value)) if len(time) > 0 else 0
+
+    for i in range(len(time) - 1, index - 1, -1):
+        time[i + 1] = time[i]
+        var[i + 1, :, :] = var[i, :, :]
+
+    time[index] = value
+    var[index, :, :] = np.ma.filled(np.ma.masked_invalid(data).astype(np.float32), np.nan)
+#-----------------------------------------------------------------------------------------------------------
+def build_cube(path, files, variable, read, date_of, units=''):
+
+    # read(file) returns (data, lats, lons) and date_of(file) the date of the file.
+    # if the cube exists, only the new dates are added, in date order (incremental mode)
+    dates = {file: date_of(file) for file in files}
+    files = sorted(files, key=dates.get)
+    cube = Dataset(path, 'a') if os.path.exists(path) else None
+    existing = set(cube_times(cube)) if cube is not None else set()
+
+    try:
+        for file in files:
+            date = dates[file]
+            if date in existing:
+                continue
+            print(f'Adding to the cube: {file}')
+            data, lats, lons = read(file)
+            if cube is None:
+                cube = create_cube(path, variable, lats, lons, units)
+            check_grid(cube, lats, lons, file)
+            append_to_cube(cube, variable, date, data)
+            existing.add(date)
+    finally:
+        if cube is not None:
+            cube.close()
+
+    return path
+#-----------------------------------------------------------------------------------------------------------
+def build_ndvi_cube(path, files, extent):
+
+    # 10-day NDVI from METOP_AVHRR_*_S10_AMs_V200.zip archives or from the *_NDV.img files
+    # (clouds masked out with the *_STM.img file next to it, when there is one)
+    def read(file):
+        if file.endswith('.zip'):
+            return read_zip_region(file, extent)
+        flag_path = file.replace('_NDV.img', '_STM.img')
+        return read_img_region(file, extent, flag_path if os.path.exists(flag_path) else None)
+
+    return build_cube(path, files, 'NDVI', read, ndvi_date)
+#-----------------------------------------------------------------------------------------------------------
+def build_netcdf_cube(path, files, variable, extent):
+
+    # LSA SAF NetCDF products (e.g. ETFAPAR 'FAPAR', ETFVC 'FVC', ETLAI 'LAI', ETAL 'AL-BB-BH')
+    def read(file):
+        with Dataset(file) as nc:
+            data, lats, lons = read_region(nc, variable, extent)
+            return np.ma.filled(data.astype(np.float32), np.nan), lats, lons
+
+    def date_of(file):
+        with Dataset(file) as nc:
+            date = netcdf_time(nc)
+        if date is None:
+            raise ValueError(f'{file}: no image_reference_time or time_coverage_start attribute')
+        return date
+
+    return build_cube(path, files, variable, read, date_of)
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,109 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import requests                                    # HTTP library for Python
+from requests.adapters import HTTPAdapter          # Connection pool for a requests session
+from requests.auth import HTTPBasicAuth            # Basic authentication
+from concurrent.futures import ThreadPoolExecutor  # Bounded pool of worker threads
+#-----------------------------------------------------------------------------------------------------------
+def create_session(user=None, password=None, pool_size=8, retries=3):
+
+    # one session for every download: the TCP / TLS connections are reused between files
+    session = requests.Session()
+    if user is not None:
+        session.auth = HTTPBasicAuth(user, password)
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+#-----------------------------------------------------------------------------------------------------------
+def remote_info(session, url, timeout=60):
+
+    # size and ETag of the remote file (None when the file does not exist on the server)
+    response = session.head(url, allow_redirects=True, timeout=timeout)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+
+    size = int(response.headers.get('Content-Length', -1))
+    etag = response.headers.get('ETag')
+
+    return size, etag
+#-----------------------------------------------------------------------------------------------------------
+def is_present(local_path, size, etag):
+
+    # the file is already there if the size matches (and the ETag, when the server provides one)
+    if not os.path.exists(local_path) or os.path.getsize(local_path) != size:
+        return False
+    if etag is not None and os.path.exists(local_path + '.etag'):
+        with open(local_path + '.etag') as f:
+            return f.read() == etag
+
+    return True
+#-----------------------------------------------------------------------------------------------------------
+def download_file(session, url, local_path, chunk_size=1024*1024, timeout=60):
+
+    # returns 'skipped', 'downloaded' or 'not found'. network errors are raised, not hidden
+    info = remote_info(session, url, timeout)
+    if info is None:
+        return 'not found'
+    size, etag = info
+
+    if is_present(local_path, size, etag):
+        return 'skipped'
+
+    # resume a partial download with a HTTP Range request
+    part_path = local_path + '.part'
+    start = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if size >= 0 and start > size:
+        start = 0
+    headers = {}
+    if start > 0:
+        headers['Range'] = f'bytes={start}-'
+        if etag is not None:
+            headers['If-Range'] = etag
+
+    # the partial file may already be complete
+    if start == 0 or start != size:
+        with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+
+            # append if the server accepted the range, otherwise start again from the beginning
+            mode = 'ab' if response.status_code == 206 else 'wb'
+
+            # streamed, chunked write to the temporary file
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+
+    if size >= 0 and os.path.getsize(part_path) != size:
+        raise IOError(f'Incomplete download: {url}')
+
+    # atomic rename: a file with the final name is always complete
+    os.replace(part_path, local_path)
+    if etag is not None:
+        with open(local_path + '.etag', 'w') as f:
+            f.write(etag)
+
+    return 'downloaded'
+#-----------------------------------------------------------------------------------------------------------
+def download_files(session, jobs, max_workers=4, chunk_size=1024*1024, timeout=60):
+
+    # jobs: list of (url, local path). returns a dictionary {local path: status}
+    def run(job):
+        url, local_path = job
+        os.makedirs(os.path.dirname(local_path) or '.', exist_ok=True)
+        try:
+            status = download_file(session, url, local_path, chunk_size, timeout)
+        except (requests.RequestException, IOError) as error:
+            status = f'error ({error})'
+        print(f'{os.path.basename(local_path)}: {status}')
+        return local_path, status
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = dict(executor.map(run, jobs))
+
+    return results
+#-----------------------------------------------------------------------------------------------------------
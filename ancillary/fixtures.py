@@ -0,0 +1,313 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import gzip                                        # Compress the H SAF h64 files (.nc.gz)
+import shutil                                      # Copy the file objects
+import zipfile                                     # Write the ENDVI10 archives
+import argparse                                    # Command line options
+import numpy as np                                 # Import the Numpy package
+from datetime import datetime, timedelta           # Basic date and time types
+from netCDF4 import Dataset                        # Read / write NetCDF4 files
+from catalog import product_files                  # File names of the products
+from readers import AVHRR_GRID                     # Grid of the METOP/AVHRR .img files
+#-----------------------------------------------------------------------------------------------------------
+# regular lat / lon grids of the products: first and last latitude and longitude (pixel centres) and
+# resolution. the order of the latitudes is the order of the rows in the files
+GRIDS = {
+    'MSG-Disk': {'lat': (80.0, -80.0), 'lon': (-80.0, 80.0), 'res': 0.05},
+    'GLOBE':    {'lat': (-90.0, 90.0), 'lon': (-180.0, 180.0), 'res': 0.01},
+    'h26':      {'lat': (90.0, -90.0), 'lon': (0.0, 359.9), 'res': 0.1},
+    'h64':      {'lat': (-90.0, 90.0), 'lon': (-180.0, 180.0), 'res': 0.25},
+}
+
+# FCI L1C FDHSI channels (name: number of columns of the full disk) and number of chunks (BODY files)
+FCI_CHANNELS = {'vis_04': 11136, 'vis_05': 11136, 'vis_06': 11136, 'vis_08': 11136, 'vis_09': 11136,
+                'nir_13': 11136, 'nir_16': 11136, 'nir_22': 11136, 'ir_38': 5568, 'wv_63': 5568,
+                'wv_73': 5568, 'ir_87': 5568, 'ir_97': 5568, 'ir_105': 5568, 'ir_123': 5568, 'ir_133': 5568}
+FCI_CHUNKS = 40
+FCI_FILE = ('W_XX-EUMETSAT-Darmstadt,IMG+SAT,MTI1+FCI-1C-RRAD-FDHSI-FD--CHK-BODY--DIS-NC4E_C_EUMT_{created}_IDPFI_OPE_'
+            '{start}_{end}_N_JLS_C_{cycle:04d}_{chunk:04d}.nc')
+
+# FCI reference grids (number of columns: scale factor and offset of the x / y scan angles, radians). the
+# angle of the column / row n (from 1) is offset - n * step (x, west to east) and n * step - offset (y, south to north)
+FCI_GRIDS = {11136: (2.79435763233999e-05, 0.155603804756852), 5568: (5.58871526031607e-05, 0.155617776423501)}
+
+# central wavenumber (cm-1) of the IR channels, solar irradiance of the VIS / NIR channels (mW m-2 (cm-1)-1)
+# and radiation constants c1 (mW m-2 sr-1 (cm-1)-4) and c2 (K cm) of the brightness temperatures
+FCI_WAVENUMBERS = {'ir_38': 2631.6, 'wv_63': 1587.3, 'wv_73': 1369.9, 'ir_87': 1149.4, 'ir_97': 1030.9,
+                   'ir_105': 952.4, 'ir_123': 813.0, 'ir_133': 751.9}
+FCI_SOLAR_IRRADIANCE = 50.0
+PLANCK_C1, PLANCK_C2 = 1.191042e-5, 1.4387769
+
+# rows written at once (the full grids do not need to fit in memory)
+BLOCK_ROWS = 200
+#-----------------------------------------------------------------------------------------------------------
+def grid_coords(grid, scale=1):
+
+    # pixel centres of a grid. scale > 1 writes a coarser grid (faster, smaller files) with the same extent
+    res = grid['res'] * scale
+    lats = np.linspace(grid['lat'][0], grid['lat'][1], int(round(abs(grid['lat'][1] - grid['lat'][0]) / res)) + 1)
+    lons = np.linspace(grid['lon'][0], grid['lon'][1], int(round(abs(grid['lon'][1] - grid['lon'][0]) / res)) + 1)
+
+    return lats.astype(np.float32), lons.astype(np.float32)
+#-----------------------------------------------------------------------------------------------------------
+def field(lats, lons, time, low, high, seed=0):
+
+    # smooth, realistic looking field (large scale pattern + noise) that changes with the time
+    phase = time.timetuple().tm_yday / 365.0 * 2 * np.pi
+    lat, lon = np.radians(lats)[:, None], np.radians(lons)[None, :]
+    pattern = 0.5 + 0.3 * np.cos(lat * 2) * np.cos(lon * 3 + phase) + 0.2 * np.sin(lat * 5 + lon * 4)
+    noise = np.random.default_rng(seed).normal(0, 0.03, pattern.shape)
+
+    return low + (high - low) * np.clip(pattern + noise, 0, 1)
+#-----------------------------------------------------------------------------------------------------------
+def write_grid_file(path, grid, variables, time, attributes, scale=1, with_time=True):
+
+    # NetCDF4 file on a regular grid. variables: name: (dtype, scale_factor, add_offset, fill value, low, high, units)
+    lats, lons = grid_coords(grid, scale)
+
+    with Dataset(path, 'w', format='NETCDF4') as file:
+        file.setncatts(attributes)
+        file.createDimension('lat', len(lats))
+        file.createDimension('lon', len(lons))
+        file.createVariable('lat', 'f4', ('lat',))[:] = lats
+        file.createVariable('lon', 'f4', ('lon',))[:] = lons
+        dims = ('lat', 'lon')
+        if with_time:
+            file.createDimension('time', 1)
+            file.createVariable('time', 'f8', ('time',), fill_value=None)[:] = (time - datetime(1970, 1, 1)).total_seconds()
+            file.variables['time'].units = 'seconds since 1970-01-01 00:00:00'
+            dims = ('time', 'lat', 'lon')
+
+        for seed, (name, (dtype, scale_factor, add_offset, fill, low, high, units)) in enumerate(variables.items()):
+            var = file.createVariable(name, dtype, dims, zlib=True, complevel=4, fill_value=fill,
+                                      chunksizes=(1,) * (len(dims) - 2) + (min(256, len(lats)), min(256, len(lons))))
+            var.units = units
+            if scale_factor != 1 or add_offset != 0:
+                var.scale_factor = scale_factor
+                var.add_offset = add_offset
+
+            # write by blocks of rows, with some missing values (e.g. sea or clouds)
+            for row in range(0, len(lats), BLOCK_ROWS):
+                rows = slice(row, min(row + BLOCK_ROWS, len(lats)))
+                values = field(lats[rows], lons, time, low, high, seed + row)
+                values = np.ma.masked_where(np.random.default_rng(row).random(values.shape) < 0.1, values)
+                if with_time:
+                    var[0, rows, :] = values
+                else:
+                    var[rows, :] = values
+
+    return path
+#-----------------------------------------------------------------------------------------------------------
+def write_dlst(path, time, scale=1):
+    return write_grid_file(path, GRIDS['MSG-Disk'], {'LST_MAX': ('i2', 0.01, 0.0, -8000, -10, 60, 'Celsius')}, time,
+                           {'time_coverage_start': (time - timedelta(days=10)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                            'image_reference_time': time.strftime('%Y-%m-%dT%H:%M:%SZ'), 'platform': 'MSG3'}, scale)
+#-----------------------------------------------------------------------------------------------------------
+def write_edlst(path, time, scale=1):
+    return write_grid_file(path, GRIDS['GLOBE'], {'LST-day': ('i2', 0.01, 0.0, -8000, -20, 65, 'Celsius'),
+                                                  'aquisition_time-day': ('i2', 1.0, 0.0, -1, 0, 1440, 'minutes')}, time,
+                           {'time_coverage_start': time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                            'image_reference_time': time.strftime('%Y-%m-%dT%H:%M:%SZ'), 'platform': 'M01'}, scale)
+#-----------------------------------------------------------------------------------------------------------
+def write_h26(path, time, scale=1):
+    return write_grid_file(path, GRIDS['h26'], {'var42': ('f4', 1, 0, np.float32(-9e33), 0, 1, '')}, time, {}, scale)
+#-----------------------------------------------------------------------------------------------------------
+def write_h64(path, time, scale=1):
+
+    # the files are distributed compressed (.nc.gz)
+    plain = path[:-3] if path.endswith('.gz') else path
+    write_grid_file(plain, GRIDS['h64'], {'acc_rr': ('f4', 1, 0, np.float32(-9999), 0, 80, 'mm')}, time, {}, scale, with_time=False)
+    if plain != path:
+        with open(plain, 'rb') as f_in, gzip.open(path, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(plain)
+
+    return path
+#-----------------------------------------------------------------------------------------------------------
+def write_endvi10(path, time, scale=1, grid=AVHRR_GRID, img=False):
+
+    # archive with the NDV (counts, 251-255 missing) and STM (quality flags, bit 1 = cloud) .img files
+    # (scale is not used: the size of the .img files is fixed)
+    res = grid['res']
+    lats = grid['max_lat'] - res/2 - res * np.arange(grid['nrow'])
+    lons = grid['min_lon'] + res/2 + res * np.arange(grid['ncol'])
+    prefix = time.strftime('METOP_AVHRR_%Y%m%d_S10_AMs')
+    out_dir = os.path.dirname(path)
+
+    members = []
+    for suffix in ('NDV', 'STM'):
+        member = os.path.join(out_dir, f'{prefix}_{suffix}.img')
+        with open(member, 'wb') as f:
+            for row in range(0, grid['nrow'], BLOCK_ROWS):
+                rows = slice(row, min(row + BLOCK_ROWS, grid['nrow']))
+                if suffix == 'NDV':
+                    counts = np.round(field(lats[rows], lons, time, 0, 250, row)).astype(np.uint8)
+                    counts[np.random.default_rng(row).random(counts.shape) < 0.05] = 255
+                else:
+                    counts = (np.random.default_rng(row).random((rows.stop - rows.start, grid['ncol'])) < 0.15).astype(np.uint8) << 1
+                f.write(counts.tobytes())
+        members.append(member)
+
+    # stored members (no compression), like the downloaded archives
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as zip_file:
+        for member in members:
+            zip_file.write(member, os.path.basename(member))
+    if not img:
+        for member in members:
+            os.remove(member)
+
+    return path
+#-----------------------------------------------------------------------------------------------------------
+def write_frp_pixel(path, time, scale=1, fires=2000):
+
+    # list of fire pixels inside the MSG disk (coordinates x 100, FRP x 10), HDF5 file
+    rng = np.random.default_rng(int(time.timestamp()))
+    with Dataset(path, 'w', format='NETCDF4') as file:
+        file.SENSING_START_TIME = time.strftime('%Y%m%d%H%M%S')
+        file.createDimension('fires', fires)
+        file.createVariable('LATITUDE', 'i2', ('fires',))[:] = np.round(rng.uniform(-35, 10, fires) * 100)
+        file.createVariable('LONGITUDE', 'i2', ('fires',))[:] = np.round(rng.uniform(-75, -30, fires) * 100)
+        file.createVariable('FRP', 'i4', ('fires',))[:] = np.round(rng.gamma(1.5, 40, fires) * 10)
+
+    return path
+#-----------------------------------------------------------------------------------------------------------
+def fci_radiance(channel, values):
+
+    # effective radiance of a field from 0 to 1: brightness temperatures from 200 to 310 K (IR channels)
+    # or reflectances from 0 to 100 % with the sun at the zenith (VIS / NIR channels)
+    if channel in FCI_WAVENUMBERS:
+        wavenumber = FCI_WAVENUMBERS[channel]
+        return PLANCK_C1 * wavenumber**3 / np.expm1(PLANCK_C2 * wavenumber / (200 + 110 * np.asarray(values)))
+
+    return np.asarray(values) * FCI_SOLAR_IRRADIANCE / np.pi
+#-----------------------------------------------------------------------------------------------------------
+def write_fci_l1c(out_dir, time, scale=1, chunks=None, cycle=None):
+
+    # FDHSI full disk, split in the BODY chunk files (each one with some rows of every channel), with the
+    # variables read by the satpy 'fci_l1c_nc' reader. scale is not used: satpy expects the full size grids.
+    # chunks: numbers (from 1, south to north) of the files to write (all by default). every file has all the
+    # channels (satpy requires them)
+    end = time + timedelta(minutes=10)
+    if cycle is None:
+        cycle = time.hour * 6 + time.minute // 10 + 1
+    paths = []
+    for chunk in (chunks or range(1, FCI_CHUNKS + 1)):
+        chunk_start = time + (end - time) * (chunk - 1) / FCI_CHUNKS
+        chunk_end = chunk_start + (end - time) / FCI_CHUNKS
+        path = os.path.join(out_dir, FCI_FILE.format(created=end.strftime('%Y%m%d%H%M%S'), start=chunk_start.strftime('%Y%m%d%H%M%S'),
+                                                     end=chunk_end.strftime('%Y%m%d%H%M%S'), cycle=cycle, chunk=chunk))
+        with Dataset(path, 'w', format='NETCDF4') as file:
+            file.platform = 'MTI1'
+
+            # auxiliary data of the scan swath (one per chunk), found through the index maps of the channels
+            file.createDimension('index', 1)
+            file.createVariable('index', 'u2', ('index',))[:] = chunk
+            file.createVariable('time', 'f8', ('index',))[:] = (chunk_start - datetime(2000, 1, 1)).total_seconds()
+            file.variables['time'].units = 'seconds since 2000-01-01 00:00:00.0'
+            state = file.createGroup('state')
+            celestial, platform = state.createGroup('celestial'), state.createGroup('platform')
+            for group, name, value in ((celestial, 'earth_sun_distance', 149597870.7), (celestial, 'sun_satellite_distance', 149597870.7),
+                                       (celestial, 'subsolar_latitude', 0.0), (celestial, 'subsolar_longitude', 0.0),
+                                       (platform, 'platform_altitude', 35786400.0), (platform, 'subsatellite_latitude', 0.0),
+                                       (platform, 'subsatellite_longitude', 0.0)):
+                group.createVariable(name, 'f8', ('index',))[:] = value
+
+            data = file.createGroup('data')
+            data.createVariable('swath_direction', 'u1', ('index',))[:] = 0
+            data.createVariable('swath_number', 'u2', ('index',))[:] = chunk
+            projection = data.createVariable('mtg_geos_projection', 'i4')
+            projection.setncatts({'grid_mapping_name': 'geostationary', 'perspective_point_height': 35786400.0,
+                                  'semi_major_axis': 6378137.0, 'semi_minor_axis': 6356752.31424518,
+                                  'inverse_flattening': 298.257223563, 'longitude_of_projection_origin': 0.0,
+                                  'sweep_angle_axis': 'y'})
+
+            for channel, size in FCI_CHANNELS.items():
+                step, offset = FCI_GRIDS[size]
+                rows = np.array_split(np.arange(1, size + 1), FCI_CHUNKS)[chunk - 1]
+                measured = data.createGroup(channel).createGroup('measured')
+                measured.createDimension('y', len(rows))
+                measured.createDimension('x', size)
+
+                # scan angles: integer column / row numbers, scaled to radians
+                x = measured.createVariable('x', 'u2', ('x',))
+                x.setncatts({'scale_factor': -step, 'add_offset': offset})
+                x.set_auto_scale(False)
+                x[:] = np.arange(1, size + 1)
+                y = measured.createVariable('y', 'u2', ('y',))
+                y.setncatts({'scale_factor': step, 'add_offset': -offset})
+                y.set_auto_scale(False)
+                y[:] = rows
+                measured.createVariable('start_position_row', 'i4')[:] = rows[0]
+                measured.createVariable('end_position_row', 'i4')[:] = rows[-1]
+
+                # calibration: IR channels to brightness temperature (200 - 310 K), VIS / NIR to reflectance (0 - 100 %)
+                for name in ('radiance_to_bt_conversion_coefficient_wavenumber', 'radiance_to_bt_conversion_coefficient_a',
+                             'radiance_to_bt_conversion_coefficient_b', 'radiance_to_bt_conversion_constant_c1',
+                             'radiance_to_bt_conversion_constant_c2', 'channel_effective_solar_irradiance'):
+                    measured.createVariable(name, 'f4')
+                measured.createVariable('radiance_unit_conversion_coefficient', 'f4')[:] = 1.0
+                if channel in FCI_WAVENUMBERS:
+                    wavenumber = FCI_WAVENUMBERS[channel]
+                    for name, value in (('coefficient_wavenumber', wavenumber), ('coefficient_a', 1.0), ('coefficient_b', 0.0),
+                                        ('constant_c1', PLANCK_C1), ('constant_c2', PLANCK_C2)):
+                        measured.variables['radiance_to_bt_conversion_' + name][:] = value
+                else:
+                    measured.variables['channel_effective_solar_irradiance'][:] = FCI_SOLAR_IRRADIANCE
+
+                # 12 bit counts (65535 = space pixels, outside the disk)
+                radiance = measured.createVariable('effective_radiance', 'u2', ('y', 'x'), zlib=True, complevel=4, fill_value=65535)
+                scale_factor = float(fci_radiance(channel, 1.0)) / 4000
+                radiance.setncatts({'scale_factor': scale_factor, 'add_offset': 0.0, 'warm_scale_factor': scale_factor,
+                                    'warm_add_offset': 0.0, 'valid_range': np.array([0, 4095], 'u2'),
+                                    'long_name': 'Effective Radiance', 'units': 'mW.m-2.sr-1.(cm-1)-1',
+                                    'ancillary_variables': 'pixel_quality'})
+
+                # the scan angles (+/- 9 degrees) are stretched to give the pattern of the field a global size
+                x_angle, y_angle = offset - step * np.arange(1, size + 1), rows * step - offset
+                disk = (x_angle[None, :]**2 + y_angle[:, None]**2) < 0.1515**2
+                values = field(np.degrees(y_angle) * 10, np.degrees(x_angle) * 10, time, 0, 1, chunk)
+                radiance[:] = np.ma.masked_where(~disk, fci_radiance(channel, values))
+                measured.createVariable('pixel_quality', 'u1', ('y', 'x'), zlib=True)[:] = np.where(disk, 0, 3)
+                measured.createVariable('index_map', 'u2', ('y', 'x'), zlib=True, fill_value=65535)[:] = np.ma.masked_where(~disk, np.full(disk.shape, chunk))
+        paths.append(path)
+
+    return paths
+#-----------------------------------------------------------------------------------------------------------
+# writer of each product of the catalog
+WRITERS = {'DLST': write_dlst, 'EDLST': write_edlst, 'ENDVI10': write_endvi10, 'FRP-PIXEL': write_frp_pixel,
+           'h26': write_h26, 'h64': write_h64}
+#-----------------------------------------------------------------------------------------------------------
+def generate(products, start, end, out_dir='fixtures', scale=1, **options):
+
+    # write every file of the products between two datetimes, with the names of the real files.
+    # 'FCI' writes one repeat cycle (40 BODY files) every 10 minutes
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for product in products:
+        if product == 'FCI':
+            time = start
+            while time <= end:
+                paths.extend(write_fci_l1c(out_dir, time, scale, **options.get('FCI', {})))
+                time = time + timedelta(minutes=10)
+            continue
+        for product_file in product_files(product, start, end, out_dir):
+            if not os.path.exists(product_file['local_path']):
+                print(f'Writing: {product_file["local_path"]}')
+                WRITERS[product](product_file['local_path'], product_file['time'], scale, **options.get(product, {}))
+            paths.append(product_file['local_path'])
+
+    return paths
+#-----------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Synthetic LSA SAF / H SAF / FCI files for offline tests and benchmarks')
+    parser.add_argument('products', nargs='*', default=list(WRITERS) + ['FCI'])
+    parser.add_argument('--start', default='2023-07-11T00:00', help='first time (YYYY-MM-DDTHH:MM)')
+    parser.add_argument('--end', default='2023-07-11T23:59', help='last time (YYYY-MM-DDTHH:MM)')
+    parser.add_argument('--out', default='fixtures', help='output folder')
+    parser.add_argument('--scale', type=int, default=1, help='coarser grids (1 = full size; not used by ENDVI10 and FCI)')
+    args = parser.parse_args()
+
+    generate(args.products, datetime.fromisoformat(args.start), datetime.fromisoformat(args.end), args.out, args.scale)
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,134 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import hashlib                                     # Hash of the shapefiles
+import pickle                                      # Store the geometries in a binary file
+import shapely                                     # Geometries (WKB conversion and simplification)
+import cartopy.crs as ccrs                         # Projection of the geometries (PlateCarree)
+import cartopy.io.shapereader as shpreader         # Import shapefiles
+#-----------------------------------------------------------------------------------------------------------
+# cache folder shared by the saf and mtg scripts (next to this module)
+GEOMETRY_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'geometry_cache')
+#-----------------------------------------------------------------------------------------------------------
+# simplification tolerance (degrees) of each map scale: boundaries drawn at 0.3 - 0.5 linewidth on a country
+# map do not need the full precision of the polygons
+TOLERANCES = {'full': 0.0, 'city': 0.001, 'northeast': 0.005, 'brazil': 0.02, 'continent': 0.05}
+#-----------------------------------------------------------------------------------------------------------
+# Natural Earth layers used by the maps: (category, name) and default style (as the cartopy features)
+NATURAL_EARTH = {'land':      (('physical', 'land'), {'facecolor': '#efefdb', 'edgecolor': 'none', 'zorder': -1}),
+                 'ocean':     (('physical', 'ocean'), {'facecolor': '#97b6e1', 'edgecolor': 'none', 'zorder': -1}),
+                 'rivers':    (('physical', 'rivers_lake_centerlines'), {'facecolor': 'none', 'edgecolor': '#97b6e1'}),
+                 'coastline': (('physical', 'coastline'), {'facecolor': 'none', 'edgecolor': 'black'}),
+                 'borders':   (('cultural', 'admin_0_boundary_lines_land'), {'facecolor': 'none', 'edgecolor': 'black'})}
+
+#-----------------------------------------------------------------------------------------------------------
+# geometries already loaded by this process (key: shapefile path, modification time, scale and extent)
+loaded = {}
+#-----------------------------------------------------------------------------------------------------------
+def shapefile_hash(shapefile):
+
+    # hash of the geometries (.shp) and of the attributes (.dbf) of the shapefile
+    sha = hashlib.sha1()
+    for path in (shapefile, os.path.splitext(shapefile)[0] + '.dbf'):
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(block)
+
+    return sha.hexdigest()
+#-----------------------------------------------------------------------------------------------------------
+def map_scale(extent):
+
+    # scale of a map from its extent [min. lon, min. lat, max. lon, max. lat]
+    size = max(extent[2] - extent[0], extent[3] - extent[1])
+    if size > 60:
+        return 'continent'
+    if size > 25:
+        return 'brazil'
+    if size > 5:
+        return 'northeast'
+
+    return 'city'
+#-----------------------------------------------------------------------------------------------------------
+def map_resolution(extent):
+
+    # Natural Earth resolution of a map, as the automatic scale of the cartopy features: '10m' if the smaller
+    # side of the extent is up to 15 degrees, '50m' up to 50 degrees and '110m' above (or without extent)
+    if extent is None:
+        return '110m'
+    size = min(extent[2] - extent[0], extent[3] - extent[1])
+    if size <= 15:
+        return '10m'
+    if size <= 50:
+        return '50m'
+
+    return '110m'
+#-----------------------------------------------------------------------------------------------------------
+def cached_geometries(shapefile, key, build, cache_dir=GEOMETRY_CACHE):
+
+    # geometries stored as WKB in the cache folder (and kept in memory by this process).
+    # build(): the geometries, when they are not in the cache yet
+    memo = (os.path.abspath(shapefile), os.path.getmtime(shapefile), key)
+    if memo in loaded:
+        return loaded[memo]
+
+    name = f'{os.path.splitext(os.path.basename(shapefile))[0]}_{shapefile_hash(shapefile)[:16]}_{key}'
+    path = os.path.join(cache_dir, f'{name}.pkl')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            geometries = list(shapely.from_wkb(pickle.load(f)))
+    else:
+        geometries = build()
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(shapely.to_wkb(geometries), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+
+    loaded[memo] = geometries
+
+    return geometries
+#-----------------------------------------------------------------------------------------------------------
+def load_geometries(shapefile='BR_UF_2022.shp', extent=None, scale=None, cache_dir=GEOMETRY_CACHE):
+
+    # geometries of the shapefile, simplified for the scale of the map (from the extent, or given).
+    # the shapefile is parsed only once: the simplified geometries are stored as WKB in the cache folder
+    if scale is None:
+        scale = map_scale(extent) if extent is not None else 'full'
+
+    def build():
+        geometries = list(shpreader.Reader(shapefile).geometries())
+        if TOLERANCES[scale] > 0:
+            geometries = list(shapely.simplify(geometries, TOLERANCES[scale], preserve_topology=True))
+        return geometries
+
+    return cached_geometries(shapefile, scale, build, cache_dir)
+#-----------------------------------------------------------------------------------------------------------
+def natural_earth(layer, extent=None, resolution=None, margin=2.0, cache_dir=GEOMETRY_CACHE):
+
+    # Natural Earth layer ('land', 'ocean', 'rivers', 'coastline' or 'borders') clipped to the extent of the
+    # map [min. lon, min. lat, max. lon, max. lat] plus a margin (degrees). cartopy downloads the shapefile once;
+    # the clipped geometries of each (resolution, extent) are stored in the cache folder
+    (category, name), style = NATURAL_EARTH[layer]
+    if resolution is None:
+        resolution = map_resolution(extent)
+    shapefile = shpreader.natural_earth(resolution=resolution, category=category, name=name)
+
+    if extent is None:
+        return cached_geometries(shapefile, 'full', lambda: list(shpreader.Reader(shapefile).geometries()), cache_dir)
+
+    box = (extent[0] - margin, extent[1] - margin, extent[2] + margin, extent[3] + margin)
+
+    def build():
+        geometries = shapely.clip_by_rect(list(shpreader.Reader(shapefile).geometries()), *box)
+        return [geometry for geometry in geometries if not geometry.is_empty]
+
+    return cached_geometries(shapefile, 'box_' + '_'.join(f'{value:g}' for value in box), build, cache_dir)
+#-----------------------------------------------------------------------------------------------------------
+def add_natural_earth(ax, layer, extent=None, resolution=None, **kwargs):
+
+    # draw a cached Natural Earth layer on a cartopy map, instead of the cfeature / coastlines features
+    # (which parse the shapefiles again for every figure). kwargs: matplotlib style (e.g. facecolor='dimgray')
+    style = {**NATURAL_EARTH[layer][1], **kwargs}
+
+    return ax.add_geometries(natural_earth(layer, extent, resolution), ccrs.PlateCarree(), **style)
+#-----------------------------------------------------------------------------------------------------------
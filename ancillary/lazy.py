@@ -0,0 +1,63 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import xarray as xr                                # N-D labeled arrays (lazy, backed by dask)
+from netCDF4 import Dataset                        # Read / write NetCDF4 files
+from readers import extent_to_slices               # Regional slices of regular lat / lon grids
+#-----------------------------------------------------------------------------------------------------------
+def file_chunks(path, variable, target=(1024, 1024)):
+
+    # dask chunks that are whole multiples of the HDF5 chunks of the variable (close to the target size
+    # for the last two dimensions), so each HDF5 chunk is decoded by one task only
+    with Dataset(path) as file:
+        var = file.variables[variable]
+        dims = var.dimensions
+        shape = var.shape
+        chunking = var.chunking()
+
+    if chunking == 'contiguous':
+        chunking = [1] * (len(dims) - 2) + list(shape[-2:])
+        return dict(zip(dims, chunking))
+
+    chunks = list(chunking)
+    for i, size in zip(range(len(dims) - 2, len(dims)), target):
+        chunks[i] = min(max(1, size // chunking[i]) * chunking[i], shape[i])
+
+    return dict(zip(dims, chunks))
+#-----------------------------------------------------------------------------------------------------------
+def open_lazy(path, variable, extent=None, lat_name='lat', lon_name='lon'):
+
+    # LSA SAF NetCDF variable as a dask array: scale_factor, add_offset and _FillValue are applied lazily,
+    # and only the chunks touched by the computation (e.g. the extent) are read and decoded
+    ds = xr.open_dataset(path, engine='netcdf4', chunks=file_chunks(path, variable), mask_and_scale=True)
+    data = ds[variable]
+
+    if extent is not None:
+        with Dataset(path) as file:
+            lat_slice, lon_slice = extent_to_slices(file, extent, lat_name, lon_name)
+        data = data.isel({lat_name: lat_slice, lon_name: lon_slice})
+
+    return data
+#-----------------------------------------------------------------------------------------------------------
+def open_series(paths, variable, extent=None, lat_name='lat', lon_name='lon'):
+
+    # many files of the same grid stacked along the time dimension (nothing is read yet)
+    paths = sorted(paths)
+    data = xr.open_mfdataset(paths, engine='netcdf4', chunks=file_chunks(paths[0], variable), combine='nested',
+                             concat_dim='time', mask_and_scale=True, parallel=True, data_vars=[variable])[variable]
+
+    if extent is not None:
+        with Dataset(paths[0]) as file:
+            lat_slice, lon_slice = extent_to_slices(file, extent, lat_name, lon_name)
+        data = data.isel({lat_name: lat_slice, lon_name: lon_slice})
+
+    return data
+#-----------------------------------------------------------------------------------------------------------
+def composite(paths, variable, how='max', extent=None, lat_name='lat', lon_name='lon'):
+
+    # composite of many files (e.g. daily maximum or mean of the 96 quarter-hour slots), computed in
+    # parallel, chunk by chunk, so the memory depends on the chunk size and not on the number of files
+    data = open_series(paths, variable, extent, lat_name, lon_name)
+    result = getattr(data, how)(dim='time', skipna=True)
+
+    return result.compute()
+#-----------------------------------------------------------------------------------------------------------
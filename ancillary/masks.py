@@ -0,0 +1,50 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import hashlib                                     # Hashes of the grids and of the cache keys
+import numpy as np                                 # Import the Numpy package
+import geopandas as gp                             # Make working with geospatial data in python easier
+import regionmask                                  # Create masks of geographical regions
+from geometries import shapefile_hash              # Hash of the .shp / .dbf files
+#-----------------------------------------------------------------------------------------------------------
+# region keys of the shapefiles used in the scripts (column with the names, column with the abbreviations)
+REGION_KEYS = {'regioes_2010.shp': ('sigla', 'nome'), 'BR_UF_2022.shp': ('SIGLA_UF', 'NM_UF')}
+#-----------------------------------------------------------------------------------------------------------
+def grid_hash(lats, lons):
+
+    # the grid is defined by the coordinates of its pixel centres
+    sha = hashlib.sha1()
+    for coords in (lats, lons):
+        sha.update(np.ascontiguousarray(np.ma.filled(coords, np.nan), dtype=np.float64).tobytes())
+
+    return sha.hexdigest()
+#-----------------------------------------------------------------------------------------------------------
+def region_mask(shapefile, lats, lons, names=None, abbrevs=None, cache_dir='mask_cache'):
+
+    # integer label raster (-1 outside every region) of the regions of a shapefile on a lat / lon grid,
+    # and the names of the regions. the label of each region is its position in the list of names.
+    # the rasterization is done only once per (shapefile, grid, region key): then it is read from the cache
+    if names is None:
+        names, abbrevs = REGION_KEYS[os.path.basename(shapefile)]
+
+    key = hashlib.sha1(f'{shapefile_hash(shapefile)} {grid_hash(lats, lons)} {names} {abbrevs}'.encode()).hexdigest()
+    path = os.path.join(cache_dir, f'mask_{key}.npz')
+
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            return cached['mask'], cached['names'].tolist()
+
+    # point in polygon test for every pixel (slow)
+    regions = regionmask.from_geopandas(gp.read_file(shapefile), names=names, abbrevs=abbrevs, name=names)
+    labels = regions.mask(np.ma.filled(lons, np.nan), np.ma.filled(lats, np.nan)).values
+
+    # region numbers to positions in the list of names
+    mask = np.full(labels.shape, -1, dtype=np.int16)
+    for index, number in enumerate(regions.numbers):
+        mask[labels == number] = index
+
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez_compressed(path, mask=mask, names=np.array(regions.names))
+
+    return mask, list(regions.names)
+#-----------------------------------------------------------------------------------------------------------
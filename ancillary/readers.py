@@ -0,0 +1,176 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import numpy as np                       # Import the Numpy package
+import struct                            # Interpret bytes as packed binary data
+import zipfile                           # Read ZIP archives
+import os                                # Miscellaneous operating system interfaces
+from datetime import datetime            # Basic date and time types
+#-----------------------------------------------------------------------------------------------------------
+def grid_definition(file, name):
+
+    # read only the first and last coordinates of a regular 1D grid (lat or lon)
+    var = file.variables[name]
+    size = var.shape[0]
+    first = float(var[0])
+    last = float(var[-1])
+
+    # spacing between pixel centres (negative when the axis is descending, e.g. MSG-Disk latitudes)
+    step = (last - first) / (size - 1) if size > 1 else 1.0
+
+    return first, step, size
+#-----------------------------------------------------------------------------------------------------------
+def coord_to_index(first, step, size, value):
+
+    # nearest pixel centre on a regular grid (same result as np.argmin(np.abs(coords - value)), in O(1))
+    index = int(np.floor((value - first) / step + 0.5))
+
+    return min(max(index, 0), size - 1)
+#-----------------------------------------------------------------------------------------------------------
+def extent_to_slices(file, extent, lat_name='lat', lon_name='lon'):
+
+    # extent: [min. lon, min. lat, max. lon, max. lat]
+    lat_first, lat_step, lat_size = grid_definition(file, lat_name)
+    lon_first, lon_step, lon_size = grid_definition(file, lon_name)
+
+    # latitude and longitude indexes of the extent corners
+    lat_a = coord_to_index(lat_first, lat_step, lat_size, extent[1])
+    lat_b = coord_to_index(lat_first, lat_step, lat_size, extent[3])
+    lon_a = coord_to_index(lon_first, lon_step, lon_size, extent[0])
+    lon_b = coord_to_index(lon_first, lon_step, lon_size, extent[2])
+
+    # the slices always go forward in the file, whatever the orientation of the axis,
+    # so the hyperslab keeps the same row order as the original file
+    lat_slice = slice(min(lat_a, lat_b), max(lat_a, lat_b))
+    lon_slice = slice(min(lon_a, lon_b), max(lon_a, lon_b))
+
+    return lat_slice, lon_slice
+#-----------------------------------------------------------------------------------------------------------
+def read_region(file, var_name, extent, time_index=0, lat_name='lat', lon_name='lon'):
+
+    # compute the slices without reading the coordinate arrays
+    lat_slice, lon_slice = extent_to_slices(file, extent, lat_name, lon_name)
+
+    # read only the requested hyperslab (with or without the time dimension)
+    var = file.variables[var_name]
+    if var.ndim == 3:
+        data = var[time_index, lat_slice, lon_slice]
+    else:
+        data = var[lat_slice, lon_slice]
+
+    # regional lats and lons
+    lats = file.variables[lat_name][lat_slice]
+    lons = file.variables[lon_name][lon_slice]
+
+    return data, lats, lons
+#-----------------------------------------------------------------------------------------------------------
+# METOP/AVHRR 10-day NDVI synthesis ("flat binary" .img files, information from the product manual)
+AVHRR_GRID = {'nrow': 9072, 'ncol': 6720, 'min_lon': -93.0, 'max_lat': 25.0, 'res': 60.0 / 6720}
+#-----------------------------------------------------------------------------------------------------------
+def img_window(extent, grid=AVHRR_GRID):
+
+    # the rows of the .img files are stored from north to south
+    res = grid['res']
+    row_a = coord_to_index(grid['max_lat'] - res/2, -res, grid['nrow'], extent[3])
+    row_b = coord_to_index(grid['max_lat'] - res/2, -res, grid['nrow'], extent[1])
+    col_a = coord_to_index(grid['min_lon'] + res/2, res, grid['ncol'], extent[0])
+    col_b = coord_to_index(grid['min_lon'] + res/2, res, grid['ncol'], extent[2])
+
+    return slice(row_a, row_b), slice(col_a, col_b)
+#-----------------------------------------------------------------------------------------------------------
+def decode_ndvi(counts, flags=None):
+
+    # apply scale and offset only on the window (float32)
+    data = np.float32(-0.08) + np.float32(0.004) * counts.astype(np.float32)
+
+    # mask out the missing value
+    data[counts > 250] = np.nan
+
+    # get specific bit from byte array (clouds) and apply the flag
+    if flags is not None:
+        data[((flags >> 1) & 1) == 1] = np.nan
+
+    # south to north, like the arrays used with origin='lower'
+    return np.flipud(data)
+#-----------------------------------------------------------------------------------------------------------
+def window_coords(rows, cols, grid=AVHRR_GRID):
+
+    # pixel centres of a window, with latitudes from south to north
+    res = grid['res']
+    lats = grid['max_lat'] - res/2 - res * np.arange(rows.start, rows.stop)
+    lons = grid['min_lon'] + res/2 + res * np.arange(cols.start, cols.stop)
+
+    return lats[::-1], lons
+#-----------------------------------------------------------------------------------------------------------
+def read_img_region(path, extent, flag_path=None, grid=AVHRR_GRID):
+
+    # map the files instead of reading them: only the pages of the window are touched
+    rows, cols = img_window(extent, grid)
+    shape = (grid['nrow'], grid['ncol'])
+    counts = np.array(np.memmap(path, dtype='uint8', mode='r', shape=shape)[rows, cols])
+
+    # quality flags (STM file)
+    flags = None
+    if flag_path is not None:
+        flags = np.array(np.memmap(flag_path, dtype='uint8', mode='r', shape=shape)[rows, cols])
+
+    lats, lons = window_coords(rows, cols, grid)
+
+    return decode_ndvi(counts, flags), lats, lons
+#-----------------------------------------------------------------------------------------------------------
+def zip_member(zip_file, suffix):
+
+    # find the member of the archive that ends with a given suffix (e.g. '_NDV.img')
+    for name in zip_file.namelist():
+        if name.endswith(suffix):
+            return zip_file.getinfo(name)
+
+    raise KeyError(f'No member ending with {suffix} in {zip_file.filename}')
+#-----------------------------------------------------------------------------------------------------------
+def zip_member_offset(path, info):
+
+    # position of the member data: local file header (30 bytes) + file name + extra field
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+
+    return info.header_offset + 30 + name_len + extra_len
+#-----------------------------------------------------------------------------------------------------------
+def read_zip_window(path, suffix, rows, cols, grid=AVHRR_GRID):
+
+    shape = (grid['nrow'], grid['ncol'])
+
+    with zipfile.ZipFile(path) as zip_file:
+        info = zip_member(zip_file, suffix)
+
+        # stored (uncompressed) members: map the bytes directly inside the archive
+        if info.compress_type == zipfile.ZIP_STORED:
+            offset = zip_member_offset(path, info)
+            return np.array(np.memmap(path, dtype='uint8', mode='r', offset=offset, shape=shape)[rows, cols])
+
+        # compressed members: inflate sequentially, keeping only the rows of the window
+        with zip_file.open(info) as f:
+            f.seek(rows.start * grid['ncol'])
+            block = np.frombuffer(f.read((rows.stop - rows.start) * grid['ncol']), dtype='uint8')
+
+    return block.reshape(-1, grid['ncol'])[:, cols].copy()
+#-----------------------------------------------------------------------------------------------------------
+def read_zip_region(path, extent, flags=True, grid=AVHRR_GRID):
+
+    # NDV and STM files straight from the downloaded METOP_AVHRR_*_S10_AMs_V200.zip archives
+    rows, cols = img_window(extent, grid)
+    counts = read_zip_window(path, '_NDV.img', rows, cols, grid)
+    flag_counts = read_zip_window(path, '_STM.img', rows, cols, grid) if flags else None
+
+    lats, lons = window_coords(rows, cols, grid)
+
+    return decode_ndvi(counts, flag_counts), lats, lons
+#-----------------------------------------------------------------------------------------------------------
+def ndvi_date(path):
+
+    # start date of the 10-day synthesis, from the file name (METOP_AVHRR_yyyymmdd_S10_...)
+    file_name = os.path.basename(path)
+    date_str = file_name[file_name.find("AVHRR_")+6:file_name.find("_S10")]
+
+    return datetime.strptime(date_str, '%Y%m%d')
+#-----------------------------------------------------------------------------------------------------------
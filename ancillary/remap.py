@@ -0,0 +1,89 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import json                                        # Text form of the grid definitions (cache keys)
+import hashlib                                     # Hashes of the cache keys
+import numpy as np                                 # Import the Numpy package
+import pyproj                                      # Python interface to PROJ (cartographic projections)
+#-----------------------------------------------------------------------------------------------------------
+# geostationary full disk grids: projection, size, extent of the pixel edges in metres (x min, y min, x max,
+# y max, north up) and the order of the rows and columns in the arrays of the files
+GEOS_GRIDS = {
+    # LSA SAF MSG-Disk HDF5 files (SEVIRI, 3 km at the sub-satellite point): north up, west to east.
+    # the grid is not centred on the sub-satellite point (3000.403 m pixels)
+    'MSG-Disk': {'proj': {'proj': 'geos', 'h': 35785831.0, 'a': 6378169.0, 'b': 6356583.8, 'lon_0': 0.0, 'sweep': 'y'},
+                 'nrow': 3712, 'ncol': 3712,
+                 'extent': (-5570248.4773392612, -5567248.074173444, 5567248.074173444, 5570248.4773392612),
+                 'north_first': True, 'west_first': True},
+    # FCI L1C (2 km IR and 1 km VIS channels): stored upside down (first row south, first column east)
+    'FCI-2km':  {'proj': {'proj': 'geos', 'h': 35786400.0, 'a': 6378137.0, 'b': 6356752.31414, 'lon_0': 0.0, 'sweep': 'y'},
+                 'nrow': 5568, 'ncol': 5568,
+                 'extent': (-5567999.998577303, -5567999.998577303, 5567999.998577303, 5567999.998577303),
+                 'north_first': False, 'west_first': False},
+    'FCI-1km':  {'proj': {'proj': 'geos', 'h': 35786400.0, 'a': 6378137.0, 'b': 6356752.31414, 'lon_0': 0.0, 'sweep': 'y'},
+                 'nrow': 11136, 'ncol': 11136,
+                 'extent': (-5567999.998577303, -5567999.998577303, 5567999.998577303, 5567999.998577303),
+                 'north_first': False, 'west_first': False},
+}
+#-----------------------------------------------------------------------------------------------------------
+def target_coords(extent, res):
+
+    # pixel centres of the lat / lon box [min. lon, min. lat, max. lon, max. lat] (latitudes from north to south)
+    lats = np.arange(extent[3] - res/2, extent[1], -res)
+    lons = np.arange(extent[0] + res/2, extent[2], res)
+
+    return lats, lons
+#-----------------------------------------------------------------------------------------------------------
+def build_index_map(grid, extent, res):
+
+    # flat index (row * ncol + col) of the geostationary pixel of each target pixel, -1 outside the disk
+    lats, lons = target_coords(extent, res)
+    lon, lat = np.meshgrid(lons, lats)
+    x, y = pyproj.Proj(grid['proj'])(lon, lat, errcheck=False)
+
+    # pixel of each projected coordinate (from the north-west corner)
+    x_min, y_min, x_max, y_max = grid['extent']
+    col = np.floor((x - x_min) / (x_max - x_min) * grid['ncol'])
+    row = np.floor((y_max - y) / (y_max - y_min) * grid['nrow'])
+    if not grid['west_first']:
+        col = grid['ncol'] - 1 - col
+    if not grid['north_first']:
+        row = grid['nrow'] - 1 - row
+
+    inside = np.isfinite(x) & np.isfinite(y) & (col >= 0) & (col < grid['ncol']) & (row >= 0) & (row < grid['nrow'])
+    index = np.full(lon.shape, -1, dtype=np.int32)
+    index[inside] = (row[inside] * grid['ncol'] + col[inside]).astype(np.int32)
+
+    return index
+#-----------------------------------------------------------------------------------------------------------
+def index_map(grid_name, extent, res, cache_dir='remap_cache'):
+
+    # index map of a (source grid, target box, resolution), computed once and saved as a compressed int32 array
+    grid = GEOS_GRIDS[grid_name]
+    key = hashlib.sha1(json.dumps([grid, list(extent), res], sort_keys=True).encode()).hexdigest()[:16]
+    path = os.path.join(cache_dir, f'index_{grid_name}_{key}.npz')
+
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            return cached['index']
+
+    index = build_index_map(grid, extent, res)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez_compressed(path, index=index)
+
+    return index
+#-----------------------------------------------------------------------------------------------------------
+def remap(data, index, fill=np.nan):
+
+    # regular lat / lon box (north up) from the full disk array of a new slot, with a single np.take.
+    # the pixels outside the disk (and the masked pixels) get the fill value
+    if np.ma.isMaskedArray(data):
+        data = data.astype(np.float32).filled(fill)
+    out = np.take(data.reshape(-1), np.maximum(index, 0))
+
+    if isinstance(fill, float) and np.isnan(fill) and not np.issubdtype(out.dtype, np.floating):
+        out = out.astype(np.float32)
+    out[index < 0] = fill
+
+    return out
+#-----------------------------------------------------------------------------------------------------------
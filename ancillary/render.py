@@ -0,0 +1,123 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import matplotlib                                  # Comprehensive library for creating visualizations in Python
+import matplotlib.pyplot as plt                    # Plotting library
+import cartopy, cartopy.crs as ccrs                # Produce maps and other geospatial data analyses
+import numpy as np                                 # Import the Numpy package
+from matplotlib.offsetbox import AnchoredText      # Adds an anchored text box in the corner
+from matplotlib.offsetbox import OffsetImage       # Change the image size (zoom)
+from matplotlib.offsetbox import AnnotationBbox    # Creates an annotation using an OffsetBox
+from datetime import timedelta                     # Basic date and time types
+from concurrent.futures import ProcessPoolExecutor # Pool of worker processes
+from readers import read_zip_region, ndvi_date     # Regional NDVI windows and dates of the archives
+from geometries import load_geometries             # Cached (simplified) geometries of the shapefiles
+from geometries import add_natural_earth           # Cached Natural Earth layers, clipped to the extent
+#-----------------------------------------------------------------------------------------------------------
+class MapRenderer:
+
+    # map figure whose static layers (features, shapefile, coastlines, gridlines, colorbar, logo) are drawn
+    # only once. each new frame only swaps the image data and the title before saving
+    def __init__(self, extent, data, cmap, vmin, vmax, label, logo=None, figsize=(10,10), origin='lower',
+                 shapefile='BR_UF_2022.shp', right_title='Space Week Nordeste 2023'):
+
+        # choose the plot size (width x height, in inches)
+        self.fig = plt.figure(figsize=figsize)
+
+        # use the PlateCarree projection in cartopy
+        ax = plt.axes(projection=ccrs.PlateCarree())
+        self.ax = ax
+
+        # add some various map elements to the plot
+        add_natural_earth(ax, 'land', extent, facecolor='lightgray')
+        add_natural_earth(ax, 'ocean', extent, facecolor='dimgray')
+        add_natural_earth(ax, 'rivers', extent, edgecolor='blue')
+
+        # define the image extent
+        img_extent = [extent[0], extent[2], extent[1], extent[3]]
+
+        # plot the first image
+        self.img = ax.imshow(data, vmin=vmin, vmax=vmax, origin=origin, extent=img_extent, cmap=cmap)
+
+        # add a shapefile
+        shapes = load_geometries(shapefile, extent)
+        ax.add_geometries(shapes, ccrs.PlateCarree(), edgecolor='black',facecolor='none', linewidth=0.5)
+
+        # add coastlines, borders and gridlines
+        add_natural_earth(ax, 'coastline', extent, resolution='50m', edgecolor='black', linewidth=0.8)
+        add_natural_earth(ax, 'borders', extent, edgecolor='black', linewidth=0.5)
+        gl = ax.gridlines(crs=ccrs.PlateCarree(), color='white', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 181, 5), ylocs=np.arange(-90, 91, 5), draw_labels=True)
+        gl.top_labels = False
+        gl.right_labels = False
+        gl.xpadding = -5
+        gl.ypadding = -5
+
+        # add a colorbar
+        plt.colorbar(self.img, label=label, extend='both', orientation='vertical', pad=0.03, fraction=0.05)
+
+        # add the titles (the left one changes for every frame)
+        self.title = plt.title('', fontweight='bold', fontsize=10, loc='left')
+        plt.title(right_title, fontsize=10, loc='right')
+
+        # add an achored text inside the plot
+        text = AnchoredText("INPE / CGCT / DISSM", loc='lower left', prop={'size': 10}, frameon=True)
+        ax.add_artist(text)
+
+        # add a logo to the plot
+        if logo is not None:
+            imagebox = OffsetImage(plt.imread(logo), zoom = 0.5)
+            ab = AnnotationBbox(imagebox, (0.84, 0.92), xycoords="axes fraction", frameon = True, zorder=6)
+            ax.add_artist(ab)
+
+    def render(self, data, title, path, dpi=300):
+
+        # swap the image and the title, then save the frame
+        self.img.set_data(data)
+        self.title.set_text(title)
+        self.fig.savefig(path, bbox_inches='tight', pad_inches=0, dpi=dpi)
+
+    def close(self):
+        plt.close(self.fig)
+#-----------------------------------------------------------------------------------------------------------
+# settings and figure of each worker process
+worker = {}
+#-----------------------------------------------------------------------------------------------------------
+def init_worker(extent, cmap, vmin, vmax, out_dir, dpi, options):
+
+    # non-interactive backend: each worker keeps its own figure
+    matplotlib.use('Agg')
+    worker.update(extent=extent, cmap=cmap, vmin=vmin, vmax=vmax, out_dir=out_dir, dpi=dpi, options=options, renderer=None)
+#-----------------------------------------------------------------------------------------------------------
+def render_ndvi_frame(path):
+
+    # read the region of the archive
+    data, lats, lons = read_zip_region(path, worker['extent'])
+
+    # create the figure of this worker with the first frame it receives
+    if worker['renderer'] is None:
+        worker['renderer'] = MapRenderer(worker['extent'], data, worker['cmap'], worker['vmin'], worker['vmax'], **worker['options'])
+
+    # dates of the 10-day synthesis
+    date_start = ndvi_date(path)
+    date_end = date_start + timedelta(days=10)
+    date_start_str = date_start.strftime('%Y-%m-%d')
+
+    # replace the image and the title and save the frame
+    title = f'METOP/AVHRR - NDVI - 10-Daily Synthesis\n{date_start_str} - {date_end.strftime("%Y-%m-%d")}'
+    frame = os.path.join(worker['out_dir'], f'NDVI_{date_start_str}.png')
+    worker['renderer'].render(data, title, frame, worker['dpi'])
+
+    return frame
+#-----------------------------------------------------------------------------------------------------------
+def render_ndvi_frames(files, extent, cmap, vmin, vmax, out_dir, processes=None, dpi=300, **options):
+
+    # the frames are ordered by the date in the file name (not by the modification time of the files)
+    files = sorted(files, key=ndvi_date)
+
+    # one process per core, each one with its own figure. map keeps the order of the files
+    with ProcessPoolExecutor(max_workers=processes, initializer=init_worker,
+                             initargs=(extent, cmap, vmin, vmax, out_dir, dpi, options)) as executor:
+        frames = list(executor.map(render_ndvi_frame, files))
+
+    return frames
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,98 @@
+#-----------------------------------------------------------------------------------------------------------
+# Smoke test of the GIF writer (run with: python -m pytest ancillary)
+import numpy as np                       # Import the Numpy package
+from PIL import Image                    # Python imaging library
+from animation import write_animation    # Streaming GIF / MP4 / WebM writer
+#-----------------------------------------------------------------------------------------------------------
+def gif_tables(path):
+
+    # (global colour table flag, local colour table flags of the frames) of a GIF file
+    data = open(path, 'rb').read()
+    pos = 13 + (3 * 2 ** ((data[10] & 7) + 1) if data[10] & 0x80 else 0)
+    local = []
+
+    def skip_blocks(pos):
+        while data[pos]:
+            pos += data[pos] + 1
+        return pos + 1
+
+    while data[pos] != 0x3B:
+        if data[pos] == 0x21:
+            pos = skip_blocks(pos + 2)
+        else:
+            flags = data[pos + 9]
+            local.append(bool(flags & 0x80))
+            pos += 10 + (3 * 2 ** ((flags & 7) + 1) if flags & 0x80 else 0)
+            pos = skip_blocks(pos + 1)
+
+    return bool(data[10] & 0x80), local
+#-----------------------------------------------------------------------------------------------------------
+def test_two_frame_gif(tmp_path):
+
+    # two frames with different colours: the second one has a colour that is not in the first one
+    first = np.zeros((40, 60, 3), dtype=np.uint8)
+    first[:, :30] = (0, 128, 0)
+    second = first.copy()
+    second[10:20, 40:50] = (200, 30, 30)
+
+    frames = []
+    for n, data in enumerate([first, second]):
+        frames.append(str(tmp_path / f'frame_{n}.png'))
+        Image.fromarray(data).save(frames[-1])
+
+    path = write_animation(frames, str(tmp_path / 'animation.gif'), fps=2)
+
+    # two frames, a global palette with the colours of both frames and no local colour tables
+    with Image.open(path) as gif:
+        assert gif.n_frames == 2
+        assert gif.info['duration'] == 500
+        gif.seek(1)
+        assert gif.palette is not None
+        assert tuple(np.asarray(gif.convert('RGB'))[15, 45]) == (200, 30, 30)
+
+    assert gif_tables(path) == (True, [False, False])
+#-----------------------------------------------------------------------------------------------------------
+def test_frames_in_order(tmp_path):
+
+    # five frames: a moving square with a different colour in each frame (the fourth has the colour of
+    # the third), then the last frame repeated
+    colours = [(200, 30, 30), (30, 200, 30), (30, 30, 200), (30, 30, 200), (220, 220, 0)]
+    frames = []
+    for n, colour in enumerate(colours):
+        data = np.zeros((40, 60, 3), dtype=np.uint8)
+        data[5:15, 10 * n:10 * n + 10] = colour
+        frames.append(str(tmp_path / f'frame_{n}.png'))
+        Image.fromarray(data).save(frames[-1])
+    frames.append(frames[-1])
+
+    path = write_animation(frames, str(tmp_path / 'animation.gif'), fps=4)
+
+    with Image.open(path) as gif:
+        assert gif.n_frames == 6
+        for n, colour in enumerate(colours + colours[-1:]):
+            gif.seek(n)
+            rgb = np.asarray(gif.convert('RGB'))
+            column = 10 * min(n, 4) + 5
+            assert tuple(rgb[10, column]) == colour
+            if 0 < n < 5:
+                assert tuple(rgb[10, column - 10]) == (0, 0, 0)
+            assert tuple(rgb[30, 30]) == (0, 0, 0)
+
+    assert gif_tables(path) == (True, [False] * 6)
+#-----------------------------------------------------------------------------------------------------------
+def test_local_palettes(tmp_path):
+
+    # without the shared palette every frame has its own colour table
+    frames = []
+    for n, colour in enumerate([(200, 30, 30), (30, 200, 30), (30, 30, 200)]):
+        frames.append(str(tmp_path / f'frame_{n}.png'))
+        Image.new('RGB', (20, 10), colour).save(frames[-1])
+
+    path = write_animation(frames, str(tmp_path / 'animation.gif'), shared_palette=False)
+
+    with Image.open(path) as gif:
+        assert gif.n_frames == 3
+        gif.seek(2)
+        assert tuple(np.asarray(gif.convert('RGB'))[5, 5]) == (30, 30, 200)
+    assert gif_tables(path)[1] == [True, True, True]
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,34 @@
+#-----------------------------------------------------------------------------------------------------------
+# Test of the resolution of the background crop (run with: python -m pytest ancillary)
+import numpy as np                       # Import the Numpy package
+import matplotlib                        # Comprehensive library for creating visualizations in Python
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt          # Plotting library
+import cartopy.crs as ccrs               # Produce maps and other geospatial data analyses
+import background                        # Module under test
+#-----------------------------------------------------------------------------------------------------------
+def test_crop_width_from_axes_and_savefig_dpi(monkeypatch):
+
+    # widths requested from the tile pyramid (the pyramid itself is not built)
+    widths = []
+    def crop(extent, width, image, cache_dir):
+        widths.append(width)
+        return np.zeros((2, 2, 3), dtype=np.uint8), [extent[0], extent[2], extent[1], extent[3]]
+    monkeypatch.setattr(background, 'background_crop', crop)
+
+    # square map on a 10 x 5 inch figure: the axes are 5 inches wide, not 10
+    extent = [-50.0, -20.0, -30.0, 0.0]
+    fig = plt.figure(figsize=(10, 5), dpi=100)
+    ax = plt.axes(projection=ccrs.PlateCarree())
+    ax.set_extent([extent[0], extent[2], extent[1], extent[3]], ccrs.PlateCarree())
+
+    background.add_background(ax, extent)
+    background.add_background(ax, extent, dpi=300)
+    with matplotlib.rc_context({'savefig.dpi': 200}):
+        background.add_background(ax, extent)
+    plt.close(fig)
+
+    width = ax.get_window_extent().width
+    assert width < 0.6 * 10 * 100
+    assert np.allclose(widths, [width, 3 * width, 2 * width])
+#-----------------------------------------------------------------------------------------------------------
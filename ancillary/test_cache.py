@@ -0,0 +1,69 @@
+#-----------------------------------------------------------------------------------------------------------
+# Tests of the product cache (run with: python -m pytest ancillary)
+import os                                          # Miscellaneous operating system interfaces
+import time                                        # Time access and conversions
+import requests                                    # HTTP library for Python (network errors)
+from datetime import datetime                      # Basic date and time types
+from multiprocessing import Process                # Overlapping runs
+from cache import ProductCache                     # Cache under test
+#-----------------------------------------------------------------------------------------------------------
+def product_file(cache_dir, name):
+    return {'local_path': os.path.join(cache_dir, name), 'url': name, 'product': 'TEST', 'time': datetime(2023, 7, 11)}
+#-----------------------------------------------------------------------------------------------------------
+def fetch(url, path, size=1000):
+
+    # stand-in of the downloader: 'bad*' fails, 'missing*' is not on the server. every fetch is counted
+    if url.startswith('bad'):
+        raise requests.ConnectionError('connection refused')
+    if url.startswith('missing'):
+        return 'not found'
+    time.sleep(0.2)
+    with open(path + '.count', 'a') as f:
+        f.write('x')
+    with open(path + '.etag', 'w') as f:
+        f.write('"etag"')
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    return 'downloaded'
+#-----------------------------------------------------------------------------------------------------------
+def test_batch_larger_than_budget(tmp_path):
+
+    # the files of a batch are kept even above the budget, and only existing files are returned
+    cache = ProductCache(str(tmp_path), max_bytes=3500)
+    names = [f'file_{n}.zip' for n in range(9)]
+    paths = cache.get_many([product_file(str(tmp_path), name) for name in names], fetch)
+
+    assert len(paths) == 9 and all(os.path.exists(path) for path in paths)
+
+    # the next batch removes the least recently used files, with their ETag files
+    paths = cache.get_many([product_file(str(tmp_path), 'new.zip')], fetch)
+    assert paths == [str(tmp_path / 'new.zip')]
+    remaining = [name for name in names if os.path.exists(tmp_path / name)]
+    assert len(remaining) == 2
+    assert not any(os.path.exists(tmp_path / (name + '.etag')) for name in names if name not in remaining)
+    assert os.listdir(tmp_path / 'locks') == []
+#-----------------------------------------------------------------------------------------------------------
+def test_errors_reported(tmp_path):
+
+    # a failed or missing file does not stop the others
+    cache = ProductCache(str(tmp_path))
+    files = [product_file(str(tmp_path), name) for name in ('a.zip', 'bad.zip', 'missing.zip', 'b.zip')]
+
+    assert cache.get_many(files, fetch) == [str(tmp_path / 'a.zip'), str(tmp_path / 'b.zip')]
+#-----------------------------------------------------------------------------------------------------------
+def run_get(cache_dir):
+    ProductCache(cache_dir).get(product_file(cache_dir, 'shared.zip'), fetch)
+#-----------------------------------------------------------------------------------------------------------
+def test_overlapping_processes(tmp_path):
+
+    # several processes asking for the same file: it is fetched only once, and the lock file is removed
+    processes = [Process(target=run_get, args=(str(tmp_path),)) for i in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert open(tmp_path / 'shared.zip.count').read() == 'x'
+    assert os.listdir(tmp_path / 'locks') == []
+#-----------------------------------------------------------------------------------------------------------
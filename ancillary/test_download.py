@@ -0,0 +1,113 @@
+#-----------------------------------------------------------------------------------------------------------
+# Tests of the downloader against a local HTTP server with Range support (run with: python -m pytest ancillary)
+import os                                                             # Miscellaneous operating system interfaces
+import threading                                                      # Server thread
+import pytest                                                         # Test framework
+import requests                                                       # HTTP library for Python
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler   # Local stand-in of the download server
+from download import create_session, download_file, download_files    # Downloader under test
+#-----------------------------------------------------------------------------------------------------------
+# files of the server: name: (content, ETag). 'broken.zip' answers the HEAD request but fails on GET
+FILES = {'a.zip': (bytes(range(256)) * 400, '"etag-a"'),
+         'b.zip': (b'0123456789' * 1000, '"etag-b"'),
+         'broken.zip': (b'x' * 100, '"etag-broken"')}
+#-----------------------------------------------------------------------------------------------------------
+class Handler(BaseHTTPRequestHandler):
+
+    # requests received by the server: (method, path, Range header)
+    log = []
+
+    def log_message(self, *args):
+        pass
+
+    def send_head(self):
+        self.log.append((self.command, self.path, self.headers.get('Range')))
+        name = self.path.lstrip('/')
+        if name not in FILES:
+            self.send_error(404)
+            return None
+        if self.command == 'GET' and name == 'broken.zip':
+            self.send_error(500)
+            return None
+
+        content, etag = FILES[name]
+        start = 0
+        if self.headers.get('Range') and self.headers.get('If-Range') in (None, etag):
+            start = int(self.headers['Range'].split('=')[1].split('-')[0])
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(content) - 1}/{len(content)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(content) - start))
+        self.send_header('ETag', etag)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+
+        return content[start:]
+
+    def do_HEAD(self):
+        self.send_head()
+
+    def do_GET(self):
+        body = self.send_head()
+        if body is not None:
+            self.wfile.write(body)
+#-----------------------------------------------------------------------------------------------------------
+@pytest.fixture
+def server():
+
+    # server on a free port, in a background thread
+    Handler.log = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+#-----------------------------------------------------------------------------------------------------------
+def test_download_then_skip(server, tmp_path):
+
+    session = create_session(retries=0)
+    local_path = str(tmp_path / 'a.zip')
+
+    assert download_file(session, f'{server}/a.zip', local_path) == 'downloaded'
+    assert open(local_path, 'rb').read() == FILES['a.zip'][0]
+    assert open(local_path + '.etag').read() == FILES['a.zip'][1]
+    assert not os.path.exists(local_path + '.part')
+
+    # same size and ETag: only the HEAD request is sent
+    Handler.log = []
+    assert download_file(session, f'{server}/a.zip', local_path) == 'skipped'
+    assert [method for method, path, byte_range in Handler.log] == ['HEAD']
+#-----------------------------------------------------------------------------------------------------------
+def test_resume(server, tmp_path):
+
+    # a partial file left by an interrupted download is completed with a Range request
+    content = FILES['a.zip'][0]
+    local_path = str(tmp_path / 'a.zip')
+    with open(local_path + '.part', 'wb') as f:
+        f.write(content[:30000])
+
+    assert download_file(create_session(retries=0), f'{server}/a.zip', local_path) == 'downloaded'
+    assert open(local_path, 'rb').read() == content
+    assert ('GET', '/a.zip', 'bytes=30000-') in Handler.log
+#-----------------------------------------------------------------------------------------------------------
+def test_not_found_and_errors(server, tmp_path):
+
+    session = create_session(retries=0)
+    assert download_file(session, f'{server}/missing.zip', str(tmp_path / 'missing.zip')) == 'not found'
+
+    # a server error is raised by download_file
+    with pytest.raises(requests.HTTPError):
+        download_file(session, f'{server}/broken.zip', str(tmp_path / 'broken.zip'))
+
+    # and reported by download_files, without stopping the other files
+    jobs = [(f'{server}/{name}', str(tmp_path / name)) for name in ('a.zip', 'broken.zip', 'b.zip', 'missing.zip')]
+    results = download_files(session, jobs, max_workers=2)
+
+    assert results[str(tmp_path / 'a.zip')] == 'downloaded'
+    assert results[str(tmp_path / 'b.zip')] == 'downloaded'
+    assert results[str(tmp_path / 'missing.zip')] == 'not found'
+    assert results[str(tmp_path / 'broken.zip')].startswith('error')
+    assert not os.path.exists(tmp_path / 'broken.zip')
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,40 @@
+#-----------------------------------------------------------------------------------------------------------
+# Test of the synthetic FCI files with the satpy reader (run with: python -m pytest ancillary)
+import warnings                          # Warnings of the satpy reader (missing chunks)
+import numpy as np                       # Import the Numpy package
+import pytest                            # Test framework
+from datetime import datetime            # Basic date and time types
+from fixtures import write_fci_l1c       # Synthetic FCI L1C chunk files
+#-----------------------------------------------------------------------------------------------------------
+def test_fci_chunk_read_by_satpy(tmp_path):
+
+    satpy = pytest.importorskip('satpy')
+
+    # chunk 21 only (the first one north of the equator): satpy fills the other 39 with missing values
+    paths = write_fci_l1c(str(tmp_path), datetime(2023, 7, 11, 12, 0), chunks=(21,))
+    assert len(paths) == 1
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        scn = satpy.Scene(filenames=paths, reader='fci_l1c_nc')
+        scn.load(['ir_105', 'vis_06'], upper_right_corner='NE')
+
+    ir = scn['ir_105']
+    assert ir.shape == (5568, 5568)
+    assert scn['vis_06'].shape == (11136, 11136)
+    assert ir.attrs['start_time'] == datetime(2023, 7, 11, 12, 0)
+    assert ir.attrs['platform_name'] == 'Meteosat-12'
+
+    # rows of the chunk (north up), brightness temperatures of the fixture and space pixels outside the disk
+    bt = ir.values
+    rows = np.where(~np.all(np.isnan(bt), axis=1))[0]
+    assert len(rows) == 139
+    assert np.nanmin(bt) > 199.9 and np.nanmax(bt) < 310.1
+    assert np.isnan(bt[rows[0], 0]) and not np.isnan(bt[rows[0], 2784])
+
+    # geolocation of the area: the chunk is just north of the equator, at the sub-satellite longitude
+    lon, lat = ir.attrs['area'].get_lonlat(rows[-1], 2784)
+    assert abs(lon) < 0.1 and 0 < lat < 0.1
+    lon, lat = ir.attrs['area'].get_lonlat(rows[0], 2784)
+    assert 2 < lat < 3
+#-----------------------------------------------------------------------------------------------------------
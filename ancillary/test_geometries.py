@@ -0,0 +1,54 @@
+#-----------------------------------------------------------------------------------------------------------
+# Tests of the cached Natural Earth layers (run with: python -m pytest ancillary)
+import os                                         # Miscellaneous operating system interfaces
+import shapefile                                  # Write the test shapefile (pyshp, used by cartopy)
+import geometries                                 # Module under test
+#-----------------------------------------------------------------------------------------------------------
+def write_squares(path):
+
+    # shapefile with two 10 x 10 degree squares: one over Brazil and one over Africa
+    with shapefile.Writer(path, shapeType=shapefile.POLYGON) as writer:
+        writer.field('name', 'C')
+        for name, (lon, lat) in (('brazil', (-45, -15)), ('africa', (15, 0))):
+            writer.poly([[(lon, lat), (lon, lat + 10), (lon + 10, lat + 10), (lon + 10, lat), (lon, lat)]])
+            writer.record(name)
+
+    return path + '.shp'
+#-----------------------------------------------------------------------------------------------------------
+def test_natural_earth_clipped_and_cached(tmp_path, monkeypatch):
+
+    # the Natural Earth shapefile is replaced by the test shapefile (no download)
+    path = write_squares(str(tmp_path / 'ne_50m_land'))
+    requested = []
+    monkeypatch.setattr(geometries.shpreader, 'natural_earth', lambda **kwargs: requested.append(kwargs) or path)
+    monkeypatch.setattr(geometries, 'loaded', {})
+    cache_dir = str(tmp_path / 'cache')
+
+    # Brazilian northeast: only the Brazil square, clipped to the extent plus the margin
+    extent = [-50.0, -20.0, -31.0, 0.0]
+    geoms = geometries.natural_earth('land', extent, margin=1.0, cache_dir=cache_dir)
+    assert len(geoms) == 1
+    assert geoms[0].bounds == (-45.0, -15.0, -35.0, -5.0)
+    assert requested == [{'resolution': '50m', 'category': 'physical', 'name': 'land'}]
+    assert len(os.listdir(cache_dir)) == 1
+
+    # smaller extent: the square is cut at the border of the box
+    geoms = geometries.natural_earth('land', [-40.0, -10.0, -38.0, -8.0], margin=1.0, cache_dir=cache_dir)
+    assert geoms[0].bounds == (-41.0, -11.0, -37.0, -7.0)
+    assert requested[-1]['resolution'] == '10m'
+    assert len(os.listdir(cache_dir)) == 2
+
+    # a new process reads the clipped geometries from the cache, without parsing the shapefile
+    monkeypatch.setattr(geometries, 'loaded', {})
+    monkeypatch.setattr(geometries.shpreader, 'Reader', None)
+    geoms = geometries.natural_earth('land', extent, margin=1.0, cache_dir=cache_dir)
+    assert geoms[0].bounds == (-45.0, -15.0, -35.0, -5.0)
+#-----------------------------------------------------------------------------------------------------------
+def test_map_resolution():
+
+    # as the automatic scale of the cartopy features (smaller side of the extent)
+    assert geometries.map_resolution(None) == '110m'
+    assert geometries.map_resolution([-120.0, -60.0, 0.0, 15.0]) == '110m'
+    assert geometries.map_resolution([-75.0, -37.0, -33.0, 8.0]) == '50m'
+    assert geometries.map_resolution([5.0, 47.0, 16.0, 55.0]) == '10m'
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,49 @@
+#-----------------------------------------------------------------------------------------------------------
+# Tests of the geostationary index maps (run with: python -m pytest ancillary)
+import numpy as np                                     # Import the Numpy package
+import pytest                                          # Test framework
+from remap import GEOS_GRIDS, build_index_map, remap   # Index maps of the geostationary grids
+#-----------------------------------------------------------------------------------------------------------
+# (lat, lon) and (row, col) of the MSG-Disk pixel, from pyresample ('msg_seviri_fes_3km' area)
+MSG_PIXELS = [((0.0, 0.0), (1856, 1856)),
+              ((-20.0, -40.0), (2540, 637)),
+              ((-22.9, -43.2), (2627, 594)),
+              ((-15.8, -47.9), (2393, 435)),
+              ((-3.7, -38.5), (1986, 590)),
+              ((-25.0, 30.0), (2712, 2782)),
+              ((10.0, 20.0), (1495, 2562)),
+              ((-33.0, 18.4), (2962, 2399))]
+#-----------------------------------------------------------------------------------------------------------
+def pixel(grid_name, lat, lon):
+
+    # (row, col) of the pixel of a single target point (1 x 1 box around it)
+    grid = GEOS_GRIDS[grid_name]
+    index = build_index_map(grid, [lon - 0.0005, lat - 0.0005, lon + 0.0005, lat + 0.0005], 0.001)
+
+    return divmod(int(index[0, 0]), grid['ncol'])
+#-----------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize('point, expected', MSG_PIXELS)
+def test_msg_disk_pixels(point, expected):
+
+    assert pixel('MSG-Disk', *point) == expected
+#-----------------------------------------------------------------------------------------------------------
+def test_fci_flipped():
+
+    # FCI arrays are stored upside down: the south-east of the disk is near the first row and column
+    row, col = pixel('FCI-2km', -40.0, 30.0)
+    assert row < 2784 and col < 2784
+    row, col = pixel('FCI-2km', 40.0, -30.0)
+    assert row > 2784 and col > 2784
+#-----------------------------------------------------------------------------------------------------------
+def test_remap_outside_disk():
+
+    # points off the disk get -1 in the index map and the fill value in the remapped array
+    grid = GEOS_GRIDS['MSG-Disk']
+    index = build_index_map(grid, [-100.0, -10.0, -40.0, 10.0], 5.0)
+    assert (index[:, 0] == -1).all() and (index[:, -1] >= 0).all()
+
+    data = np.arange(grid['nrow'] * grid['ncol'], dtype=np.int32).reshape(grid['nrow'], grid['ncol'])
+    out = remap(data, index)
+    assert np.isnan(out[:, 0]).all()
+    assert (out[:, -1] == index[:, -1]).all()
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,116 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import csv                                                       # Write the tables as CSV files
+import zipfile                                                   # Read ZIP archives
+import numpy as np                                               # Import the Numpy package
+from datetime import datetime                                    # Basic date and time types
+from netCDF4 import Dataset                                      # Read / write NetCDF4 files
+from readers import AVHRR_GRID, coord_to_index, grid_definition  # Grid of the .img files and regular grid indexes
+from readers import zip_member, zip_member_offset, ndvi_date     # Members of the archives and their dates
+#-----------------------------------------------------------------------------------------------------------
+# quality flag of each value: 0 = valid, 1 = cloud (STM bit), 2 = missing
+VALID, CLOUD, MISSING = 0, 1, 2
+#-----------------------------------------------------------------------------------------------------------
+def point_pixels(points, grid=AVHRR_GRID, box=0):
+
+    # rows and columns of each point (and of its neighbourhood box, box pixels to each side) in the .img files
+    res = grid['res']
+    pixels = []
+    for lat, lon in points:
+        row = coord_to_index(grid['max_lat'] - res/2, -res, grid['nrow'], lat)
+        col = coord_to_index(grid['min_lon'] + res/2, res, grid['ncol'], lon)
+        rows = np.clip(np.arange(row - box, row + box + 1), 0, grid['nrow'] - 1)
+        cols = np.clip(np.arange(col - box, col + box + 1), 0, grid['ncol'] - 1)
+        rows, cols = np.meshgrid(rows, cols, indexing='ij')
+        pixels.append((rows.ravel(), cols.ravel()))
+
+    return pixels
+#-----------------------------------------------------------------------------------------------------------
+def read_bytes(path, suffix, offsets, grid=AVHRR_GRID):
+
+    # read only the bytes at the given offsets of a member of the archive
+    with zipfile.ZipFile(path) as zip_file:
+        info = zip_member(zip_file, suffix)
+
+        # stored member: map the archive at the member offset
+        if info.compress_type == zipfile.ZIP_STORED:
+            start = zip_member_offset(path, info)
+            return np.array(np.memmap(path, dtype='uint8', mode='r', offset=start, shape=(grid['nrow'] * grid['ncol'],))[offsets])
+
+        # compressed member: move forward through the stream, reading one byte at each offset
+        order = np.argsort(offsets)
+        values = np.empty(len(offsets), dtype='uint8')
+        with zip_file.open(info) as f:
+            for i in order:
+                f.seek(int(offsets[i]))
+                values[i] = f.read(1)[0]
+
+    return values
+#-----------------------------------------------------------------------------------------------------------
+def summarize(counts, flags):
+
+    # value and quality flag of a point (mean of the valid pixels of the box)
+    missing = counts > 250
+    cloud = ((flags >> 1) & 1) == 1
+    valid = ~missing & ~cloud
+    if valid.any():
+        return float(np.mean(-0.08 + 0.004 * counts[valid].astype(np.float32))), VALID
+
+    return np.nan, (CLOUD if cloud.any() else MISSING)
+#-----------------------------------------------------------------------------------------------------------
+def ndvi_time_series(files, points, box=0, grid=AVHRR_GRID):
+
+    # tidy table (one row per time and point) from METOP_AVHRR_*_S10_AMs_V200.zip archives
+    pixels = point_pixels(points, grid, box)
+    offsets = np.concatenate([rows * grid['ncol'] + cols for rows, cols in pixels])
+    sizes = np.cumsum([0] + [len(rows) for rows, cols in pixels])
+
+    table = []
+    for path in sorted(files, key=ndvi_date):
+        counts = read_bytes(path, '_NDV.img', offsets, grid)
+        flags = read_bytes(path, '_STM.img', offsets, grid)
+        for p, (lat, lon) in enumerate(points):
+            value, flag = summarize(counts[sizes[p]:sizes[p+1]], flags[sizes[p]:sizes[p+1]])
+            table.append({'time': ndvi_date(path), 'point': p, 'lat': lat, 'lon': lon, 'value': value, 'flag': flag})
+
+    return table
+#-----------------------------------------------------------------------------------------------------------
+def netcdf_time(file):
+
+    # nominal time of a LSA SAF NetCDF file
+    for name in ('image_reference_time', 'time_coverage_start'):
+        if name in file.ncattrs():
+            return datetime.strptime(file.getncattr(name), '%Y-%m-%dT%H:%M:%SZ')
+
+    return None
+#-----------------------------------------------------------------------------------------------------------
+def netcdf_time_series(files, variable, points, box=0, lat_name='lat', lon_name='lon'):
+
+    # tidy table from NetCDF files: only the [0, j, i] pixels (or the small box) are read from each file
+    table = []
+    for path in files:
+        file = Dataset(path)
+        lat_grid = grid_definition(file, lat_name)
+        lon_grid = grid_definition(file, lon_name)
+        var = file.variables[variable]
+        for p, (lat, lon) in enumerate(points):
+            j = coord_to_index(*lat_grid, lat)
+            i = coord_to_index(*lon_grid, lon)
+            window = (slice(max(j - box, 0), j + box + 1), slice(max(i - box, 0), i + box + 1))
+            data = var[(0,) + window] if var.ndim == 3 else var[window]
+            data = np.ma.masked_invalid(data)
+            valid = data.count() > 0
+            table.append({'time': netcdf_time(file), 'point': p, 'lat': lat, 'lon': lon,
+                          'value': float(data.mean()) if valid else np.nan, 'flag': VALID if valid else MISSING})
+        file.close()
+
+    return table
+#-----------------------------------------------------------------------------------------------------------
+def write_table(table, path):
+
+    # save the table as a CSV file
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['time', 'point', 'lat', 'lon', 'value', 'flag'])
+        writer.writeheader()
+        writer.writerows(table)
+#-----------------------------------------------------------------------------------------------------------
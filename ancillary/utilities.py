@@ -1,75 +1,98 @@
 #-----------------------------------------------------------------------------------------------------------
 # Required modules
-import numpy as np                       # Import the Numpy package
-import colorsys                          # To make convertion of colormaps
+import os                                                   # Miscellaneous operating system interfaces
+import zipfile                                              # Read the color tables inside the ZIP archive
+import numpy as np                                          # Import the Numpy package
+from functools import lru_cache                             # Memoize the parsed color tables
+from matplotlib.colors import LinearSegmentedColormap       # Colormap from the CPT segments
+from matplotlib.colors import hsv_to_rgb                    # To make convertion of colormaps
 #-----------------------------------------------------------------------------------------------------------
-def loadCPT(path):
-
-    try:
-        f = open(path)
-    except:
-        print ("File ", path, "not found")
-        return None
-
-    lines = f.readlines()
-
-    f.close()
-
-    x = np.array([])
-    r = np.array([])
-    g = np.array([])
-    b = np.array([])
+# archive with the CPT color tables (ancillary folder)
+CPT_ZIP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cpt_color_tables.zip')
+#-----------------------------------------------------------------------------------------------------------
+def parse_cpt(text):
 
+    # split the lines: color model, segments (x0 r0 g0 b0 x1 r1 g1 b1) and B / F / N colors
     colorModel = 'RGB'
-
-    for l in lines:
+    segments = []
+    special = {}
+    for l in text.splitlines():
         ls = l.split()
-        if l[0] == '#':
+        if not ls:
+            continue
+        if ls[0][0] == '#':
             if ls[-1] == 'HSV':
                 colorModel = 'HSV'
-                continue
-            else:
-                continue
-        if ls[0] == 'B' or ls[0] == 'F' or ls[0] == 'N':
-            pass
+            continue
+        if ls[0] in ('B', 'F', 'N'):
+            special[ls[0]] = ls[1:4]
         else:
-            x=np.append(x,float(ls[0]))
-            r=np.append(r,float(ls[1]))
-            g=np.append(g,float(ls[2]))
-            b=np.append(b,float(ls[3]))
-            xtemp = float(ls[4])
-            rtemp = float(ls[5])
-            gtemp = float(ls[6])
-            btemp = float(ls[7])
-
-        x=np.append(x,xtemp)
-        r=np.append(r,rtemp)
-        g=np.append(g,gtemp)
-        b=np.append(b,btemp)
-
-    if colorModel == 'HSV':
-        for i in range(r.shape[0]):
-            rr, gg, bb = colorsys.hsv_to_rgb(r[i]/360.,g[i],b[i])
-        r[i] = rr ; g[i] = gg ; b[i] = bb
-
-    if colorModel == 'RGB':
-        r = r/255.0
-        g = g/255.0
-        b = b/255.0
+            segments.append(ls[:8])
+
+    # one array for the whole table: start and end of each segment, in order
+    points = np.array(segments, dtype=float).reshape(-1, 4)
+    x = points[:, 0]
+    colors = points[:, 1:4]
+    special = {key: np.array(value, dtype=float) for key, value in special.items()}
+
+    # convert the colors to RGB (0 - 1)
+    def to_rgb(c):
+        if colorModel == 'HSV':
+            return hsv_to_rgb(c * [1/360., 1, 1])
+        return c / 255.0
+
+    colors = to_rgb(colors)
+    special = {key: tuple(to_rgb(value)) for key, value in special.items()}
 
     xNorm = (x - x[0])/(x[-1] - x[0])
 
-    red   = []
-    blue  = []
-    green = []
+    colorDict = {name: np.column_stack([xNorm, colors[:, i], colors[:, i]]).tolist()
+                 for i, name in enumerate(('red', 'green', 'blue'))}
 
-    for i in range(len(x)):
-        red.append([xNorm[i],r[i],r[i]])
-        green.append([xNorm[i],g[i],g[i]])
-        blue.append([xNorm[i],b[i],b[i]])
+    return colorDict, special
+#-----------------------------------------------------------------------------------------------------------
+@lru_cache(maxsize=64)
+def read_cpt(path, member, mtime):
 
-    colorDict = {'red': red, 'green': green, 'blue': blue}
+    # parsed color table, memoized by path, member of the archive and modification time
+    if member is None:
+        with open(path) as f:
+            return parse_cpt(f.read())
+
+    with zipfile.ZipFile(path) as zip_file:
+        return parse_cpt(zip_file.read(member).decode('latin-1'))
+#-----------------------------------------------------------------------------------------------------------
+def loadCPT(path):
+
+    # color dictionary of the CPT file (to be used with LinearSegmentedColormap)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        print ("File ", path, "not found")
+        return None
+
+    colorDict, special = read_cpt(path, None, mtime)
 
     return colorDict
 #-----------------------------------------------------------------------------------------------------------
+def cpt_colormap(path, member=None, name='cpt', N=256):
+
+    # ready to use colormap of a CPT file, or of a member of a ZIP archive of CPT files.
+    # the B / F / N entries are the under / over / bad colors
+    colorDict, special = read_cpt(path, member, os.path.getmtime(path))
+
+    cmap = LinearSegmentedColormap(name, colorDict, N)
+    if 'B' in special:
+        cmap.set_under(special['B'])
+    if 'F' in special:
+        cmap.set_over(special['F'])
+    if 'N' in special:
+        cmap.set_bad(special['N'])
+
+    return cmap
+#-----------------------------------------------------------------------------------------------------------
+def cpt_table(member, N=256):
 
+    # colormap of one of the tables of cpt_color_tables.zip (e.g. 'IR4AVHRR6.cpt'), without unpacking it
+    return cpt_colormap(CPT_ZIP, member, os.path.splitext(member)[0], N)
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,86 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import csv                                         # Write the tables as CSV files
+import numpy as np                                 # Import the Numpy package
+from netCDF4 import Dataset                        # Read / write NetCDF4 files
+from readers import read_region                    # Regional window of the NetCDF files
+from timeseries import netcdf_time                 # Nominal time of the LSA SAF NetCDF files
+from masks import region_mask                      # Cached rasterized masks of the shapefile regions
+#-----------------------------------------------------------------------------------------------------------
+def zonal_stats(labels, data, names, percentiles=(10, 50, 90)):
+
+    # statistics of every zone at once. labels: integer raster (-1 outside the zones), same shape as data.
+    # returns one row (dictionary) per zone
+    data = np.ma.filled(np.ma.masked_invalid(np.ma.asarray(data, dtype=np.float64)), np.nan)
+    valid = (labels >= 0) & np.isfinite(data)
+    zone = labels[valid].astype(np.intp)
+    values = data[valid]
+    n = len(names)
+
+    # count, mean and standard deviation from the sums of each zone
+    count = np.bincount(zone, minlength=n)
+    total = np.bincount(zone, weights=values, minlength=n)
+    squares = np.bincount(zone, weights=values * values, minlength=n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        std = np.sqrt(np.maximum(squares / count - mean * mean, 0))
+
+    # min, max and percentiles: values sorted by zone, then by value (each zone is a contiguous block)
+    values = values[np.lexsort((values, zone))]
+    start = np.concatenate([[0], np.cumsum(count)[:-1]])
+    has_data = count > 0
+    last = np.maximum(count - 1, 0)
+
+    def quantile(q):
+        position = start + q * last
+        low = np.floor(position).astype(np.intp)
+        high = np.ceil(position).astype(np.intp)
+        result = np.full(n, np.nan)
+        result[has_data] = values[low[has_data]] + (values[high[has_data]] - values[low[has_data]]) * (position - low)[has_data]
+        return result
+
+    stats = {'count': count, 'mean': mean, 'min': quantile(0), 'max': quantile(1), 'std': std}
+    for p in percentiles:
+        stats[f'p{p:g}'] = quantile(p / 100)
+
+    return [{'zone': name, **{key: (int(value[i]) if key == 'count' else float(value[i])) for key, value in stats.items()}}
+            for i, name in enumerate(names)]
+#-----------------------------------------------------------------------------------------------------------
+def zonal_table(steps, labels, names, percentiles=(10, 50, 90)):
+
+    # tidy table (one row per time and zone). steps: iterable of (time, data) on the grid of the labels
+    table = []
+    for time, data in steps:
+        for row in zonal_stats(labels, data, names, percentiles):
+            table.append({'time': time, **row})
+
+    return table
+#-----------------------------------------------------------------------------------------------------------
+def netcdf_zonal_table(files, variable, extent, shapefile='BR_UF_2022.shp', percentiles=(10, 50, 90), cache_dir='mask_cache'):
+
+    # zonal statistics of a LSA SAF / H SAF product for every state (BR_UF_2022) or region (regioes_2010).
+    # the files must share the same grid: the mask is computed (or read from the cache) only once
+    table = []
+    labels = names = None
+    for path in files:
+        with Dataset(path) as file:
+            data, lats, lons = read_region(file, variable, extent)
+            if labels is None:
+                labels, names = region_mask(shapefile, lats, lons, cache_dir=cache_dir)
+            table.extend(zonal_table([(netcdf_time(file), data)], labels, names, percentiles))
+
+    return table
+#-----------------------------------------------------------------------------------------------------------
+def write_zonal_table(table, path, percentiles=(10, 50, 90)):
+
+    # save the table as a CSV file. an empty table (e.g. no zone on the grid) gives a file with the header only
+    if table:
+        fieldnames = list(table[0].keys())
+    else:
+        fieldnames = ['time', 'zone', 'count', 'mean', 'min', 'max', 'std'] + [f'p{p:g}' for p in percentiles]
+
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(table)
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,69 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import hashlib                                     # Stable hashes of the areas
+import pyproj                                      # Python interface to PROJ (cartographic projections)
+from functools import lru_cache                    # Build each area only once
+from pyresample import geometry                    # Classes for describing different geographic areas
+from satpy.resample import get_area_def            # Area definitions from their names (e.g. "south_america")
+#-----------------------------------------------------------------------------------------------------------
+# named areas: extent (min lon, min lat, max lon, max lat) and default resolution (km)
+AREAS = {
+    'brazil':        {'extent': (-75.0, -37.0, -33.0, 8.0), 'resolution': 4.0},
+    'brazil_africa': {'extent': (-70.0, -40.0, 30.0, 30.0), 'resolution': 4.0},
+    'northeast':     {'extent': (-55.0, -25.0, -26.0, 5.0), 'resolution': 4.0},
+    'south_america': {'extent': (-90.0, -60.0, -30.0, 15.0), 'resolution': 4.0},
+    'germany':       {'extent': (3.0, 43.0, 17.0, 57.0), 'resolution': 2.0},
+}
+
+# equidistant cylindrical projection of the areas
+PROJ_DICT = {'a': 6378169.0, 'b': 6378169.0, 'units': 'm', 'lon_0': 0.0, 'proj': 'eqc', 'lat_0': 0.0}
+KM_PER_DEGREE = 111.32
+#-----------------------------------------------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def custom_area(extent, resolution, area_id='my_area'):
+
+    # area definition of an extent (tuple) with pixels of the given size (km)
+    P = pyproj.Proj(proj='eqc', ellps='WGS84', preserve_units=True)
+    x1, y1 = P(extent[0], extent[1])
+    x2, y2 = P(extent[2], extent[3])
+
+    # number of pixels (width and height)
+    x_size = int(KM_PER_DEGREE * (extent[2] - extent[0]) / resolution)
+    y_size = int(KM_PER_DEGREE * (extent[3] - extent[1]) / resolution)
+
+    return geometry.AreaDefinition(area_id, 'custom area', area_id, PROJ_DICT, x_size, y_size, (x1, y1, x2, y2))
+#-----------------------------------------------------------------------------------------------------------
+def get_area(name, resolution=None):
+
+    # area definition of a named area (memoized: the same object is returned on every call)
+    resolution = float(resolution or AREAS[name]['resolution'])
+
+    return custom_area(AREAS[name]['extent'], resolution, f'{name}_{resolution:g}km')
+#-----------------------------------------------------------------------------------------------------------
+def area_extent(name):
+
+    # (min lon, min lat, max lon, max lat) of a named area
+    return list(AREAS[name]['extent'])
+#-----------------------------------------------------------------------------------------------------------
+def img_extent(name):
+
+    # extent in the order used by imshow and set_extent (min lon, max lon, min lat, max lat)
+    extent = AREAS[name]['extent']
+
+    return [extent[0], extent[2], extent[1], extent[3]]
+#-----------------------------------------------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def area_crs(name, resolution=None):
+
+    # cartopy projection of a named area
+    return get_area(name, resolution).to_cartopy_crs()
+#-----------------------------------------------------------------------------------------------------------
+def area_hash(area):
+
+    # stable hash of an area definition (or of a satpy area name, like the names given to scn.resample):
+    # it depends only on the projection, the extent and the size, so it is the same in every run
+    if isinstance(area, str):
+        area = get_area_def(area)
+
+    return area.update_hash(hashlib.sha1()).hexdigest()
+#-----------------------------------------------------------------------------------------------------------
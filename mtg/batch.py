@@ -0,0 +1,51 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import glob                                        # Unix style pathname pattern expansion
+import hdf5plugin                                  # Decompression library of the FCI files
+from satpy import Scene                            # Scene object to hold satellite data
+from areas import get_area                         # Named areas (area definitions built only once)
+from resampling import resample_cached             # Resampling with the neighbour indices cached on disk
+from chunks import select_chunk_files              # Only the BODY files (chunks) covering the area
+#-----------------------------------------------------------------------------------------------------------
+# RGBs produced for every slot
+COMPOSITES = ['airmass', 'natural_color', 'dust', 'true_color', 'convection', 'night_microphysics']
+#-----------------------------------------------------------------------------------------------------------
+def load_channels(filenames, composites, reader='fci_l1c_nc'):
+
+    # load every composite of the list at once: satpy works out the union of the channels they need,
+    # and each channel is read only once (lazily, with dask), whatever the number of composites using it
+    scn = Scene(filenames=filenames, reader=reader)
+    scn.load(composites, upper_right_corner='NE', generate=False)
+    channels = sorted({key['name'] for key in scn.keys()})
+    print(f'Channels loaded for {len(composites)} composites: {", ".join(channels)}')
+
+    return scn
+#-----------------------------------------------------------------------------------------------------------
+def run_slot(filenames, composites=COMPOSITES, area='northeast', resolution=None, out_dir='output', **resample_kwargs):
+
+    # one slot: load the channels once, resample them once (the composites are generated by the resampled
+    # scene, on the area grid) and save the enhanced images. the writers are computed together in a single
+    # dask graph, so the intermediates shared by the composites (channels, corrections) are computed only once
+    scn = load_channels(filenames, composites)
+    local = resample_cached(scn, get_area(area, resolution), **resample_kwargs)
+
+    os.makedirs(out_dir, exist_ok=True)
+    local.save_datasets(datasets=composites, writer='simple_image', base_dir=out_dir,
+                        filename='{name}_{start_time:%Y%m%d_%H%M}.png')
+
+    return local
+#-----------------------------------------------------------------------------------------------------------
+def run_batch(slot_dirs, composites=COMPOSITES, area='northeast', resolution=None, out_dir='output', **resample_kwargs):
+
+    # every slot (repeat cycle folder with the BODY files) of a list
+    for slot_dir in slot_dirs:
+        filenames = select_chunk_files(glob.glob(os.path.join(slot_dir, '*BODY*.nc')), get_area(area, resolution))
+        print(f'Processing {slot_dir} ({len(filenames)} files)')
+        run_slot(filenames, composites, area, resolution, out_dir, **resample_kwargs)
+#-----------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    # e.g. all the RGBs of the test data, on the northeast area with 4 km pixels
+    run_batch(['../samples/mtg/RC0073/'], area='northeast', resampler='nearest', radius_of_influence=5000)
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,55 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import numpy as np                                 # Import the Numpy package
+import pyproj                                      # Python interface to PROJ (cartographic projections)
+from satpy.resample import get_area_def            # Area definitions from their names (e.g. "south_america")
+#-----------------------------------------------------------------------------------------------------------
+# FCI full disk: geostationary projection, half size of the disk (metres) and number of chunks (BODY files).
+# each chunk is a band of rows, chunk 1 being the southernmost one
+FCI_PROJ = {'proj': 'geos', 'h': 35786400.0, 'a': 6378137.0, 'b': 6356752.31414, 'lon_0': 0.0, 'sweep': 'y'}
+FCI_HALF_EXTENT = 5567999.998577303
+FCI_CHUNKS = 40
+#-----------------------------------------------------------------------------------------------------------
+def chunk_number(filename):
+
+    # chunk number: last field of the name of the BODY files (..._N_JLS_C_0073_0021.nc)
+    return int(os.path.splitext(os.path.basename(filename))[0].split('_')[-1])
+#-----------------------------------------------------------------------------------------------------------
+def area_chunks(area, margin=1, step=20):
+
+    # chunks (1 - 40) intersecting the footprint of an area definition (or of a satpy area name).
+    # the footprint is sampled every "step" pixels, and "margin" chunks are added to each side
+    # (pixels near the borders of a chunk, radius of influence of the resampling)
+    if isinstance(area, str):
+        area = get_area_def(area)
+
+    lons, lats = area.get_lonlats()
+    lons = np.concatenate([lons[::step, ::step].ravel(), lons[:, [0, -1]].ravel(), lons[[0, -1], :].ravel()])
+    lats = np.concatenate([lats[::step, ::step].ravel(), lats[:, [0, -1]].ravel(), lats[[0, -1], :].ravel()])
+    x, y = pyproj.Proj(FCI_PROJ)(lons, lats, errcheck=False)
+
+    # rows of the full disk from the south (off disk points are dropped)
+    y = y[np.isfinite(x) & np.isfinite(y)]
+    position = (y + FCI_HALF_EXTENT) / (2 * FCI_HALF_EXTENT)
+    chunks = np.clip(np.floor(position * FCI_CHUNKS).astype(int) + 1, 1, FCI_CHUNKS)
+    if len(chunks) == 0:
+        return []
+
+    return list(range(max(chunks.min() - margin, 1), min(chunks.max() + margin, FCI_CHUNKS) + 1))
+#-----------------------------------------------------------------------------------------------------------
+def select_chunk_files(filenames, area, margin=1):
+
+    # only the BODY files that cover the area: the other ones are not opened, decompressed or geolocated
+    chunks = area_chunks(area, margin)
+    selected = sorted(f for f in filenames if chunk_number(f) in set(chunks))
+    if not selected:
+        name = area if isinstance(area, str) else area.area_id
+        needed = f'chunks {chunks[0]} - {chunks[-1]}' if chunks else 'no chunks (the area is outside the FCI disk)'
+        given = sorted({chunk_number(f) for f in filenames})
+        given = f'chunks {given[0]} - {given[-1]}' if given else 'no files'
+        raise ValueError(f'No BODY file covers the area "{name}": it needs {needed}, and the files given have {given}')
+    print(f'Chunks of the area: {len(selected)} of {len(filenames)} files')
+
+    return selected
+#-----------------------------------------------------------------------------------------------------------
@@ -0,0 +1,38 @@
+#-----------------------------------------------------------------------------------------------------------
+# Required modules
+import os                                          # Miscellaneous operating system interfaces
+import hashlib                                     # Hashes of the cache keys
+from areas import area_hash                        # Stable hashes of the areas
+#-----------------------------------------------------------------------------------------------------------
+# folder of the neighbour indices of the nearest neighbour resampling
+CACHE_DIR = 'resample_cache'
+#-----------------------------------------------------------------------------------------------------------
+def scene_areas_hash(scn):
+
+    # hash of the (fixed) geostationary grids of the datasets loaded in the scene (one per resolution)
+    hashes = sorted({area_hash(scn[name].attrs['area']) for name in scn.keys()})
+
+    return hashlib.sha1(' '.join(hashes).encode()).hexdigest()
+#-----------------------------------------------------------------------------------------------------------
+def cache_key(scn, area, resampler, radius_of_influence):
+    key = f'{scene_areas_hash(scn)} {area_hash(area)} {resampler} {radius_of_influence}'
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+#-----------------------------------------------------------------------------------------------------------
+def resample_cached(scn, area, resampler='nearest', radius_of_influence=None, cache_dir=CACHE_DIR, **kwargs):
+
+    # resample the scene, keeping the KD-tree neighbour indices on disk: the first run for a pair of
+    # (source grid, target area) computes them, the next runs only read them and gather the pixels
+    folder = os.path.join(cache_dir, cache_key(scn, area, resampler, radius_of_influence))
+    os.makedirs(folder, exist_ok=True)
+
+    if radius_of_influence is not None:
+        kwargs['radius_of_influence'] = radius_of_influence
+
+    return scn.resample(area, resampler=resampler, cache_dir=folder, **kwargs)
+#-----------------------------------------------------------------------------------------------------------
+def warm_cache(scn, areas, resampler='nearest', radius_of_influence=None, cache_dir=CACHE_DIR):
+
+    # compute the neighbour indices of a list of areas once (e.g. right after the first slot of the day)
+    for area in areas:
+        resample_cached(scn, area, resampler, radius_of_influence, cache_dir)
+#-----------------------------------------------------------------------------------------------------------
@@ -11,6 +11,9 @@ import os                                       # miscellaneous operating system
 import numpy as np                              # import the Numpy package
 import cartopy, cartopy.crs as ccrs             # produce maps and other geospatial data analyses
 from satpy import Scene                         # scene object to hold satellite data
+import sys                                      # system-specific parameters and functions
+sys.path.append('../ancillary')                 # add the ancillary folder to the module search path
+from geometries import add_natural_earth        # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 
 #-------------------------------------------------------------------------------------------------------------------
 
@@ -36,8 +39,8 @@ ax = plt.axes(projection=crs)
 plt.imshow(scn["ir_105"], transform=crs, extent=crs.bounds, vmin=180, vmax=320, origin='upper', cmap='jet')
 
 # add coastlines and gridlnes
-ax.coastlines(resolution='110m', color='black', linewidth=0.8)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='black', linewidth=0.5)
+add_natural_earth(ax, 'coastline', resolution='110m', edgecolor='black', linewidth=0.8)
+add_natural_earth(ax, 'borders', edgecolor='black', linewidth=0.5)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='white', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 181, 10), ylocs=np.arange(-90, 91, 10), draw_labels=False)
 
 # add a colorbar
@@ -10,21 +10,28 @@ import glob                                     # unix style pathname pattern ex
 import os                                       # miscellaneous operating system interfaces
 import numpy as np                              # import the Numpy package
 import cartopy, cartopy.crs as ccrs             # produce maps and other geospatial data analyses
-import cartopy.feature as cfeature              # common drawing and filtering operations
-import cartopy.io.shapereader as shpreader      # import shapefiles
 from satpy import Scene                         # scene object to hold satellite data
+from resampling import resample_cached          # resampling with the neighbour indices cached on disk
+from chunks import select_chunk_files           # only the BODY files (chunks) covering the area
+import sys                                      # system-specific parameters and functions
+sys.path.append('../ancillary')                 # add the ancillary folder to the module search path
+from geometries import load_geometries          # cached (simplified) geometries of the shapefiles
+from geometries import add_natural_earth        # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 
 #-------------------------------------------------------------------------------------------------------------------
 
 # initialise Scene
 path_to_testdata = '../samples/mtg/RC0073/'
-scn = Scene(filenames=glob.glob(os.path.join(path_to_testdata, '*BODY*.nc')), reader='fci_l1c_nc')
+# (only the chunks of the full disk that cover the area are read)
+filenames = select_chunk_files(glob.glob(os.path.join(path_to_testdata, '*BODY*.nc')), "south_america")
+scn = Scene(filenames=filenames, reader='fci_l1c_nc')
 
 # load the datasets/composites of interest. note: the data inside the FCI files is stored upside down. The upper_right_corner='NE' argument flips it automatically in upright position.
 scn.load(['ir_105'], upper_right_corner='NE')
 
 # resample the scene to a specified area (e.g. "eurol1" for Europe in 1km resolution)
-scn_resampled = scn.resample("south_america", resampler='nearest', radius_of_influence=5000)
+# (the KD-tree neighbour indices are computed once and then read from the "resample_cache" folder)
+scn_resampled = resample_cached(scn, "south_america", resampler='nearest', radius_of_influence=5000)
 
 # read the crs
 crs = scn_resampled["ir_105"].attrs['area'].to_cartopy_crs()
@@ -41,16 +48,16 @@ ax = plt.axes(projection=crs)
 plt.imshow(scn_resampled["ir_105"], extent=crs.bounds, vmin=180, vmax=320, origin='upper', cmap='jet')
 
 # add some various map elements to the plot
-ax.add_feature(cfeature.LAND)
-ax.add_feature(cfeature.OCEAN)
+add_natural_earth(ax, 'land')
+add_natural_earth(ax, 'ocean')
 
 # add a shapefile
-shapefile = list(shpreader.Reader('BR_UF_2022.shp').geometries())
+shapefile = load_geometries('BR_UF_2022.shp', scale='continent')
 ax.add_geometries(shapefile, ccrs.PlateCarree(), edgecolor='black',facecolor='none', linewidth=0.3)
 
 # add coastlines and gridlnes
-ax.coastlines(resolution='110m', color='black', linewidth=0.8)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='black', linewidth=0.5)
+add_natural_earth(ax, 'coastline', resolution='110m', edgecolor='black', linewidth=0.8)
+add_natural_earth(ax, 'borders', edgecolor='black', linewidth=0.5)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='white', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 181, 10), ylocs=np.arange(-90, 91, 10), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False
@@ -10,53 +10,35 @@ import glob                                     # unix style pathname pattern ex
 import os                                       # miscellaneous operating system interfaces
 import numpy as np                              # import the Numpy package
 import cartopy, cartopy.crs as ccrs             # produce maps and other geospatial data analyses
-import cartopy.io.shapereader as shpreader      # import shapefiles
-import pyproj                                   # python interface to PROJ (cartographic projections and coordinate transformations library)
-from pyresample import geometry                 # classes for describing different geographic areas using a mesh of points or pixels
+from areas import get_area, area_extent         # named areas (area definitions built only once)
 import matplotlib.patheffects as PathEffects    # define classes for path effects
 from matplotlib.offsetbox import AnchoredText   # adds an anchored text box in the corner
 from matplotlib.offsetbox import OffsetImage    # change the image size (zoom)
 from matplotlib.offsetbox import AnnotationBbox # creates an annotation using an OffsetBox
 from satpy import Scene                         # scene object to hold satellite data
+from resampling import resample_cached          # resampling with the neighbour indices cached on disk
+from chunks import select_chunk_files           # only the BODY files (chunks) covering the area
+import sys                                      # system-specific parameters and functions
+sys.path.append('../ancillary')                 # add the ancillary folder to the module search path
+from geometries import load_geometries          # cached (simplified) geometries of the shapefiles
+from geometries import add_natural_earth        # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 
 #-------------------------------------------------------------------------------------------------------------------
 
 # initialise Scene
 path_to_testdata = '../samples/mtg/RC0073/'
-scn = Scene(filenames=glob.glob(os.path.join(path_to_testdata, '*BODY*.nc')), reader='fci_l1c_nc')
+# (only the chunks of the full disk that cover the area are read)
+filenames = select_chunk_files(glob.glob(os.path.join(path_to_testdata, '*BODY*.nc')), get_area('northeast', resolution=4.0))
+scn = Scene(filenames=filenames, reader='fci_l1c_nc')
 
 #-------------------------------------------------------------------------------------------------------------------
 
 # image extent (min lon, min lat, max lon, max lat)
-extent = [-55.0, -25.00, -26.00, 5.00] # Brazilian northeast
-
-# pyproj definitions
-P = pyproj.Proj(proj='eqc', ellps='WGS84', preserve_units=True)
-G = pyproj.Geod(ellps='WGS84')
-x1,y1 = P(extent[1],extent[0])
-x2,y2 = P(extent[3],extent[2])
-
-# define km per degree
-km_per_degree = 111.32
-
-# calculate the total number of degrees in lat and lon extent
-deg_lon = extent[2] - extent[0]
-deg_lat = extent[3] - extent[1]
-
-# calculate the number of pixels (width and height)
-resolution = 4.0
-width = (km_per_degree * deg_lon) /  resolution
-height = (km_per_degree * deg_lat) /  resolution
-
-# creating an area definition on the fly
-area_id = 'my_area'
-description = 'custom area'
-proj_id = 'my_area'
-x_size = int(width)
-y_size = int(height)
-area_extent = (y1,x1,y2,x2)
-proj_dict = {'a': 6378169.0, 'b': 6378169.0,'units': 'm', 'lon_0': 0.0,'proj': 'eqc', 'lat_0': 0.0}
-area_def = geometry.AreaDefinition(area_id, description, proj_id, proj_dict, x_size, y_size, area_extent)
+# named areas: "brazil", "brazil_africa", "northeast", "south_america" and "germany" (see "areas.py")
+extent = area_extent('northeast') # Brazilian northeast
+
+# area definition of the extent with 4 km pixels (memoized, with a stable hash for the caches)
+area_def = get_area('northeast', resolution=4.0)
 
 #-------------------------------------------------------------------------------------------------------------------
 
@@ -64,7 +46,8 @@ area_def = geometry.AreaDefinition(area_id, description, proj_id, proj_dict, x_s
 scn.load(["airmass"], upper_right_corner='NE')
 
 # resample the scene to a specified area
-scn_resampled = scn.resample(area_def, resampler='nearest', radius_of_influence=5000)
+# (the KD-tree neighbour indices are computed once and then read from the "resample_cache" folder)
+scn_resampled = resample_cached(scn, area_def, resampler='nearest', radius_of_influence=5000)
 
 # read the crs
 crs = scn_resampled["airmass"].attrs['area'].to_cartopy_crs()
@@ -78,12 +61,12 @@ plt.figure(figsize=(8,7))
 ax = plt.axes(projection=crs)
 
 # add a shapefile
-shapefile = list(shpreader.Reader('BR_UF_2022.shp').geometries())
+shapefile = load_geometries('BR_UF_2022.shp', extent)
 ax.add_geometries(shapefile, ccrs.PlateCarree(), edgecolor='gold',facecolor='none', linewidth=0.3)
 
 # add coastlines, borders and gridlines
-ax.coastlines(resolution='50m', color='turquoise', linewidth=1.0)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='cyan', linewidth=0.5)
+add_natural_earth(ax, 'coastline', extent, resolution='50m', edgecolor='turquoise', linewidth=1.0)
+add_natural_earth(ax, 'borders', extent, edgecolor='cyan', linewidth=0.5)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='white', alpha=1.0, linestyle='--', linewidth=0.15, xlocs=np.arange(-180, 180, 10), ylocs=np.arange(-90, 90, 10), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False
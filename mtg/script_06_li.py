@@ -13,48 +13,26 @@ import glob                                     # unix style pathname pattern ex
 import os                                       # miscellaneous operating system interfaces
 import numpy as np                              # import the Numpy package
 import cartopy, cartopy.crs as ccrs             # produce maps and other geospatial data analyses
-import cartopy.feature as cfeature              # common drawing and filtering operations
-import pyproj                                   # python interface to PROJ (cartographic projections and coordinate transformations library)
-from pyresample import geometry                 # classes for describing different geographic areas using a mesh of points or pixels
+from areas import get_area, area_extent         # named areas (area definitions built only once)
 from matplotlib.offsetbox import OffsetImage    # change the image size (zoom)
 from matplotlib.offsetbox import AnnotationBbox # creates an annotation using an OffsetBox
 from satpy import Scene                         # scene object to hold satellite data
+from resampling import resample_cached          # resampling with the neighbour indices cached on disk
 from satpy.writers import get_enhanced_image    # get an enhanced version of dataset as an XRImage instance
+import sys                                      # system-specific parameters and functions
+sys.path.append('../ancillary')                 # add the ancillary folder to the module search path
+from geometries import add_natural_earth        # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 
 #==================================================================================================================#
 # CREATE A CUSTOM AREA
 #==================================================================================================================#
 
 # image extent (min lon, min lat, max lon, max lat)
-extent = [3.0, 43.00, 17.00, 57.00] # Germany
-
-# pyproj definitions
-P = pyproj.Proj(proj='eqc', ellps='WGS84', preserve_units=True)
-G = pyproj.Geod(ellps='WGS84')
-x1,y1 = P(extent[1],extent[0])
-x2,y2 = P(extent[3],extent[2])
-
-# define km per degree
-km_per_degree = 111.32
-
-# calculate the total number of degrees in lat and lon extent
-deg_lon = extent[2] - extent[0]
-deg_lat = extent[3] - extent[1]
-
-# calculate the number of pixels (width and height)
-resolution = 2.0
-width = (km_per_degree * deg_lon) /  resolution
-height = (km_per_degree * deg_lat) /  resolution
-
-# creating an area definition on the fly
-area_id = 'my_area'
-description = 'custom area'
-proj_id = 'my_area'
-x_size = int(width)
-y_size = int(height)
-area_extent = (y1,x1,y2,x2)
-proj_dict = {'a': 6378169.0, 'b': 6378169.0,'units': 'm', 'lon_0': 0.0,'proj': 'eqc', 'lat_0': 0.0}
-area_def = geometry.AreaDefinition(area_id, description, proj_id, proj_dict, x_size, y_size, area_extent)
+# named areas: "brazil", "brazil_africa", "northeast", "south_america" and "germany" (see "areas.py")
+extent = area_extent('germany') # Germany
+
+# area definition of the extent with 2 km pixels (memoized, with a stable hash for the caches)
+area_def = get_area('germany', resolution=2.0)
 
 #==================================================================================================================#
 # DATA READING AND MANIPULATION
@@ -68,7 +46,8 @@ scn = Scene(filenames=glob.glob(os.path.join(path_to_testdata, '*BODY*.nc')), re
 scn.load(["flash_area"], upper_right_corner='NE')
 
 # resample the scene to a specified area
-scn_resampled = scn.resample(area_def)
+# (the KD-tree neighbour indices are computed once and then read from the "resample_cache" folder)
+scn_resampled = resample_cached(scn, area_def)
 
 #==================================================================================================================#
 # PLOT THE IMAGE
@@ -84,12 +63,12 @@ ax = plt.axes(projection=ccrs.PlateCarree())
 img_extent = [extent[0], extent[2], extent[1], extent[3]]
 
 # add some map elements to the plot
-ax.add_feature(cfeature.LAND, facecolor='dimgray')
-ax.add_feature(cfeature.OCEAN, facecolor='black')
+add_natural_earth(ax, 'land', extent, facecolor='dimgray')
+add_natural_earth(ax, 'ocean', extent, facecolor='black')
 
 # add coastlines, borders and gridlines
-ax.coastlines(resolution='10m', color='turquoise', linewidth=1.0)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='white', linewidth=0.5)
+add_natural_earth(ax, 'coastline', extent, resolution='10m', edgecolor='turquoise', linewidth=1.0)
+add_natural_earth(ax, 'borders', extent, edgecolor='white', linewidth=0.5)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='white', alpha=1.0, linestyle='--', linewidth=0.15, xlocs=np.arange(-180, 180, 5), ylocs=np.arange(-90, 90, 5), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False
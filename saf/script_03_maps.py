@@ -4,12 +4,14 @@
 #-------------------------------------------------------------------------------------------------------------------
 
 # required modules
-from netCDF4 import Dataset         # read / write NetCDF4 files
-import matplotlib.pyplot as plt     # plotting library
-from datetime import datetime       # basic date and time types
-import cartopy, cartopy.crs as ccrs # produce maps and other geospatial data analyses
-import cartopy.feature as cfeature  # common drawing and filtering operations
-import numpy as np                  # import the Numpy package
+from netCDF4 import Dataset              # read / write NetCDF4 files
+import matplotlib.pyplot as plt          # plotting library
+from datetime import datetime            # basic date and time types
+import cartopy, cartopy.crs as ccrs      # produce maps and other geospatial data analyses
+import numpy as np                       # import the Numpy package
+import sys                               # system-specific parameters and functions
+sys.path.append('../ancillary')          # add the ancillary folder to the module search path
+from geometries import add_natural_earth # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 
 # open the file using the NetCDF4 library
 file = Dataset("../samples/NETCDF4_LSASAF_MSG_DLST-MAX10D_MSG-Disk_202307112345.nc")
@@ -38,12 +40,12 @@ img_extent = [lons.min(), lons.max(), lats.min(), lats.max()]
 img = ax.imshow(data, vmin=-10, vmax=35, origin='upper', extent=img_extent, cmap='jet')
 
 # add some various map elements to the plot
-ax.add_feature(cfeature.LAND)
-ax.add_feature(cfeature.OCEAN)
+add_natural_earth(ax, 'land')
+add_natural_earth(ax, 'ocean')
 
 # add coastlines, borders and gridlines
-ax.coastlines(resolution='50m', color='black', linewidth=0.8)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='black', linewidth=0.5)
+add_natural_earth(ax, 'coastline', resolution='50m', edgecolor='black', linewidth=0.8)
+add_natural_earth(ax, 'borders', edgecolor='black', linewidth=0.5)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='gray', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 181, 10), ylocs=np.arange(-90, 91, 10), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False
@@ -8,9 +8,12 @@ from netCDF4 import Dataset                # read / write NetCDF4 files
 import matplotlib.pyplot as plt            # plotting library
 from datetime import datetime              # basic date and time types
 import cartopy, cartopy.crs as ccrs        # produce maps and other geospatial data analyses
-import cartopy.feature as cfeature         # common drawing and filtering operations
-import cartopy.io.shapereader as shpreader # import shapefiles
 import numpy as np                         # import the Numpy package
+import sys                                 # system-specific parameters and functions
+sys.path.append('../ancillary')            # add the ancillary folder to the module search path
+from readers import extent_to_slices       # regional slices of regular lat / lon grids
+from geometries import load_geometries     # cached (simplified) geometries of the shapefiles
+from geometries import add_natural_earth   # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 import matplotlib                          # comprehensive library for creating visualizations in Python
 
 # open the file using the NetCDF4 library
@@ -21,20 +24,11 @@ extent = [-75.0, -37.00, -33.00, 8.00] # Brazil
 
 #-------------------------------------------------------------------------------------------------------------------
 
-# reading lats and lons
-lats = file.variables['lat'][:]
-lons = file.variables['lon'][:]
-
-# latitude lower and upper index
-latli = np.argmin( np.abs( lats - extent[1] ) )
-latui = np.argmin( np.abs( lats - extent[3] ) )
-
-# longitude lower and upper index
-lonli = np.argmin( np.abs( lons - extent[0] ) )
-lonui = np.argmin( np.abs( lons - extent[2] ) )
+# latitude and longitude slices of the extent (reads only the first and last coordinates)
+lat_slice, lon_slice = extent_to_slices(file, extent)
 
 # extract the data
-data = file.variables['LST_MAX'][ 0 , latui:latli , lonli:lonui ]
+data = file.variables['LST_MAX'][ 0 , lat_slice , lon_slice ]
 
 #-------------------------------------------------------------------------------------------------------------------
 
@@ -65,8 +59,8 @@ plt.figure(figsize=(7,7))
 ax = plt.axes(projection=ccrs.PlateCarree())
 
 # add some various map elements to the plot
-ax.add_feature(cfeature.LAND)
-ax.add_feature(cfeature.OCEAN)
+add_natural_earth(ax, 'land', extent)
+add_natural_earth(ax, 'ocean', extent)
 
 # define the image extent
 img_extent = [extent[0], extent[2], extent[1], extent[3]]
@@ -75,12 +69,12 @@ img_extent = [extent[0], extent[2], extent[1], extent[3]]
 img = ax.imshow(data, vmin=vmin, vmax=vmax, origin='upper', extent=img_extent, cmap=cmap)
 
 # add a shapefile
-shapefile = list(shpreader.Reader('BR_UF_2022.shp').geometries())
+shapefile = load_geometries('BR_UF_2022.shp', extent)
 ax.add_geometries(shapefile, ccrs.PlateCarree(), edgecolor='black',facecolor='none', linewidth=0.3)
 
 # add coastlines, borders and gridlines
-ax.coastlines(resolution='50m', color='black', linewidth=0.8)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='black', linewidth=0.5)
+add_natural_earth(ax, 'coastline', extent, resolution='50m', edgecolor='black', linewidth=0.8)
+add_natural_earth(ax, 'borders', extent, edgecolor='black', linewidth=0.5)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='gray', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 181, 5), ylocs=np.arange(-90, 91, 5), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False
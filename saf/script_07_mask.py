@@ -8,12 +8,14 @@ from netCDF4 import Dataset                # read / write NetCDF4 files
 import matplotlib.pyplot as plt            # plotting library
 from datetime import datetime              # basic date and time types
 import cartopy, cartopy.crs as ccrs        # produce maps and other geospatial data analyses
-import cartopy.feature as cfeature         # common drawing and filtering operations
-import cartopy.io.shapereader as shpreader # import shapefiles
 import numpy as np                         # import the Numpy package
+import sys                                 # system-specific parameters and functions
+sys.path.append('../ancillary')            # add the ancillary folder to the module search path
+from readers import extent_to_slices       # regional slices of regular lat / lon grids
+from geometries import load_geometries     # cached (simplified) geometries of the shapefiles
+from geometries import add_natural_earth   # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 import matplotlib                          # comprehensive library for creating visualizations in Python
-import geopandas as gp                     # make working with geospatial data in python easier
-import regionmask                          # create masks of geographical regions
+from masks import region_mask              # cached rasterized masks of the shapefile regions
 
 # open the file using the NetCDF4 library
 file = Dataset("../samples/NETCDF4_LSASAF_MSG_DLST-MAX10D_MSG-Disk_202307112345.nc")
@@ -23,40 +25,24 @@ extent = [-50.0, -20.00, -33.00, 0.00] # Brazilian northeast
 
 #-------------------------------------------------------------------------------------------------------------------
 
-# reading lats and lons
-lats = file.variables['lat'][:]
-lons = file.variables['lon'][:]
-
-# latitude lower and upper index
-latli = np.argmin( np.abs( lats - extent[1] ) )
-latui = np.argmin( np.abs( lats - extent[3] ) )
-
-# longitude lower and upper index
-lonli = np.argmin( np.abs( lons - extent[0] ) )
-lonui = np.argmin( np.abs( lons - extent[2] ) )
+# latitude and longitude slices of the extent (reads only the first and last coordinates)
+lat_slice, lon_slice = extent_to_slices(file, extent)
 
 # extract the data
-data = file.variables['LST_MAX'][ 0 , latui:latli , lonli:lonui ]
+data = file.variables['LST_MAX'][ 0 , lat_slice , lon_slice ]
 
 # masking a region using a shapefile -------------------------------------------------------------------------------
 
 # reading lats and lons
-lats = file.variables['lat'][latui:latli]
-lons = file.variables['lon'][lonli:lonui]
-
-# read the shapefile with Geopandas
-regions = gp.read_file('regioes_2010.shp')
-#display(regions)
-
-# read the subregions from the shapefile
-brazilian_regions = regionmask.from_geopandas(regions, names="sigla", abbrevs="nome", name="sigla")
-#print(brazilian_regions)
+lats = file.variables['lat'][lat_slice]
+lons = file.variables['lon'][lon_slice]
 
-# create the mask with a lat lon array
-mask = brazilian_regions.mask(lons, lats)
+# create the mask of the regions of the shapefile with the lat lon arrays
+# (rasterized only on the first run, then read from the "mask_cache" folder)
+mask, names = region_mask('regioes_2010.shp', lats, lons)
 
 # get the index for a given subregion
-index = brazilian_regions.names.index("NE")
+index = names.index("NE")
 
 # mask the data for a given subregion
 data = np.where(mask==index, data, np.nan)
@@ -94,8 +80,8 @@ plt.figure(figsize=(7,7))
 ax = plt.axes(projection=ccrs.PlateCarree())
 
 # add some various map elements to the plot
-ax.add_feature(cfeature.LAND)
-ax.add_feature(cfeature.OCEAN)
+add_natural_earth(ax, 'land', extent)
+add_natural_earth(ax, 'ocean', extent)
 
 # define the image extent
 img_extent = [extent[0], extent[2], extent[1], extent[3]]
@@ -104,12 +90,12 @@ img_extent = [extent[0], extent[2], extent[1], extent[3]]
 img = ax.imshow(data, vmin=vmin, vmax=vmax, origin='upper', extent=img_extent, cmap=cmap)
 
 # add a shapefile
-shapefile = list(shpreader.Reader('BR_UF_2022.shp').geometries())
+shapefile = load_geometries('BR_UF_2022.shp', extent)
 ax.add_geometries(shapefile, ccrs.PlateCarree(), edgecolor='black',facecolor='none', linewidth=0.3)
 
 # add coastlines, borders and gridlines
-ax.coastlines(resolution='50m', color='black', linewidth=0.8)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='black', linewidth=0.5)
+add_natural_earth(ax, 'coastline', extent, resolution='50m', edgecolor='black', linewidth=0.8)
+add_natural_earth(ax, 'borders', extent, edgecolor='black', linewidth=0.5)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='gray', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 181, 5), ylocs=np.arange(-90, 91, 5), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False
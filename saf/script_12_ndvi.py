@@ -11,9 +11,12 @@ from netCDF4 import Dataset                                          # read / wr
 import matplotlib.pyplot as plt                                      # plotting library
 from datetime import datetime, timedelta                             # basic date and time types
 import cartopy, cartopy.crs as ccrs                                  # produce maps and other geospatial data analyses
-import cartopy.feature as cfeature                                   # common drawing and filtering operations
-import cartopy.io.shapereader as shpreader                           # import shapefiles
 import numpy as np                                                   # import the Numpy package
+import sys                                                           # system-specific parameters and functions
+sys.path.append('../ancillary')                                      # add the ancillary folder to the module search path
+from readers import read_img_region                                  # regional window of the METOP/AVHRR .img files
+from geometries import load_geometries                               # cached (simplified) geometries of the shapefiles
+from geometries import add_natural_earth                             # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 import matplotlib                                                    # comprehensive library for creating visualizations in Python
 from matplotlib.offsetbox import AnchoredText                        # adds an anchored text box in the corner
 from matplotlib.offsetbox import OffsetImage                         # change the image size (zoom)
@@ -23,54 +26,13 @@ from matplotlib.offsetbox import AnnotationBbox                      # creates a
 # DATA READING AND MANIPULATION
 #==================================================================================================================#
 
-# 1. open the image file ("flat binary" format)
-file_name = 'METOP_AVHRR_20230711_S10_AMs_NDV.img'
-data = np.fromfile(f'../samples/{file_name}',dtype='uint8')
-
-# 2. basic information from manual
-nrow = 9072
-ncol = 6720
-min_lon = -93.0
-min_lat = -56.0
-max_lon = -33.0
-max_lat =  25.0
-res = (max_lon - min_lon) / ncol
-fill_value = 255
-
-# 3. geographic grid
-lats = np.arange(min_lat+(res/2), max_lat-(res/2), res)
-lons = np.arange(min_lon+(res/2), max_lon-(res/2), res)
-
-# 4. convert to 2D array
-data.shape=(nrow, ncol)
-
-# 5. convert to float64 datatype
-data = np.float64(data)
-
-# 6. mask out the missing value
-data[data > 250] = np.nan
-
-# 7. apply scale and offset
-data = - 0.08 + 0.004 * data
-
-############################
-# READ ONLY A REGION
-############################
-
 # select the extent [min. lon, min. lat, max. lon, max. lat]
 extent = [-75.0, -37.00, -33.00, 8.00] # Brazil
 
-# latitude lower and upper index
-latli = np.argmin( np.abs( lats - extent[1] ) )
-latui = np.argmin( np.abs( lats - extent[3] ) )
-
-# longitude lower and upper index
-lonli = np.argmin( np.abs( lons - extent[0] ) )
-lonui = np.argmin( np.abs( lons - extent[2] ) )
-
-# extract the data
-data = np.flipud(data)
-data = data[ latli:latui , lonli:lonui ]
+# open the image file ("flat binary" format) and read only the region
+# (grid information from the manual, scale and offset and missing values are applied in "readers.py")
+file_name = 'METOP_AVHRR_20230711_S10_AMs_NDV.img'
+data, lats, lons = read_img_region(f'../samples/{file_name}', extent)
 
 #==================================================================================================================#
 # CREATE A CUSTOM COLOR SCALE
@@ -95,9 +57,9 @@ plt.figure(figsize=(8,9))
 ax = plt.axes(projection=ccrs.PlateCarree())
 
 # add some various map elements to the plot
-ax.add_feature(cfeature.LAND, facecolor='lightgray')
-ax.add_feature(cfeature.OCEAN, facecolor='dimgray')
-ax.add_feature(cfeature.RIVERS, edgecolor='blue')
+add_natural_earth(ax, 'land', extent, facecolor='lightgray')
+add_natural_earth(ax, 'ocean', extent, facecolor='dimgray')
+add_natural_earth(ax, 'rivers', extent, edgecolor='blue')
 
 # define the image extent
 img_extent = [extent[0], extent[2], extent[1], extent[3]]
@@ -106,12 +68,12 @@ img_extent = [extent[0], extent[2], extent[1], extent[3]]
 img = ax.imshow(data, vmin=vmin, vmax=vmax, origin='lower', extent=img_extent, cmap=cmap)
 
 # add a shapefile
-shapefile = list(shpreader.Reader('BR_UF_2022.shp').geometries())
+shapefile = load_geometries('BR_UF_2022.shp', extent)
 ax.add_geometries(shapefile, ccrs.PlateCarree(), edgecolor='black',facecolor='none', linewidth=0.5)
 
 # add coastlines, borders and gridlines
-ax.coastlines(resolution='50m', color='black', linewidth=0.8)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='black', linewidth=0.5)
+add_natural_earth(ax, 'coastline', extent, resolution='50m', edgecolor='black', linewidth=0.8)
+add_natural_earth(ax, 'borders', extent, edgecolor='black', linewidth=0.5)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='white', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 181, 5), ylocs=np.arange(-90, 91, 5), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False
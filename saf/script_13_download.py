@@ -4,15 +4,18 @@
 #-------------------------------------------------------------------------------------------------------------------
 
 # required modules
-import requests                                  # HTTP library for Python
-from requests.auth import HTTPBasicAuth          # basic authentication
+import sys                                       # system-specific parameters and functions
+sys.path.append('../ancillary')                  # add the ancillary folder to the module search path
+from download import create_session              # HTTP session with a connection pool
+from download import download_file               # streamed download with resume and skip-if-present
+from cache import ProductCache                   # local cache with a byte budget (LRU eviction)
+from catalog import product_files                # expected files (urls and local paths) of a product
 import os                                        # miscellaneous operating system interfaces
-import zipfile                                   # tools to create, read, write, append, and list a ZIP file
-from datetime import datetime, timedelta         # basic date and time types
-from dateutil.relativedelta import relativedelta # unix style pathname pattern expansion
+from datetime import datetime                    # basic date and time types
 
-# local directory
+# local directory (managed cache: the least recently used files are removed above the byte budget)
 local_dir = "samples_script_13"; os.makedirs(local_dir, exist_ok=True)
+max_bytes = 5 * 1024**3
 
 # start date (yyyymmdd)
 date_start = '20230501'
@@ -20,50 +23,21 @@ date_start = '20230501'
 # end date (yyyymmdd)
 date_end = '20230721'
 
-# interval (month)
-interval = 1
-
 # convert to datetime
 date_start = datetime(int(date_start[0:4]), int(date_start[4:6]), int(date_start[6:8]))
 date_end = datetime(int(date_end[0:4]), int(date_end[4:6]), int(date_end[6:8]))
 
-# create our references for the loop
-date_loop = date_start
-
-# loop between dates
-while (date_loop <= date_end):
-
-  # days to download
-  days = ['01', '11', '21']
-
-  for day in days:
-  # for each day in the list
-
-    # download parameters
-    year = date_loop.strftime('%Y')
-    month = date_loop.strftime('%m')
-    url = 'https://datalsasaf.lsasvcs.ipma.pt/'
-    product = '/PRODUCTS/EPS/ENDVI10/ENVI/'
-    date = f'{year}/{month}/{day}/'
-    file_name = f'METOP_AVHRR_{year}{month}{day}_S10_AMs_V200.zip'
-
-    # user and password
-    user = 'INSERIR_SEU_USERNAME'
-    password = 'INSERIR_SEU_PASSWORD'
-
-    try:
-      # download file
-      print(f'Downloading the file: {file_name} ...')
-      my_request = requests.get(url + product + date + file_name, auth = HTTPBasicAuth(user, password))
-      open(local_dir + '//' + file_name, 'wb').write(my_request.content)
-
-      # unzip file
-      with zipfile.ZipFile(local_dir + '//' + file_name, 'r') as zip_ref:
-        zip_ref.extractall(local_dir)
+# user and password
+user = 'INSERIR_SEU_USERNAME'
+password = 'INSERIR_SEU_PASSWORD'
 
-      print("Download finished.")
-    except:
-      print("File not found!")
+# list of expected files between the dates (10-day synthesis: days 01, 11 and 21), with the urls and local files
+files = product_files('ENDVI10', date_start, date_end, local_dir)
 
-  # increment the reference date
-  date_loop = date_loop + relativedelta(months=interval)
\ No newline at end of file
+# download the files in parallel, sharing the connections of a single session.
+# files already in the cache are not downloaded again and partial files are resumed.
+# a file that fails is reported and does not stop the others (the paths of the files in the cache are returned).
+# the archives are not extracted: the NDV and STM files are read straight from the zip (see "../ancillary/readers.py")
+session = create_session(user, password)
+cache = ProductCache(local_dir, max_bytes)
+paths = cache.get_many(files, lambda url, local_path: download_file(session, url, local_path), max_workers=4)
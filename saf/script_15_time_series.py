@@ -7,132 +7,45 @@
 # REQUIRED MODULES
 #==================================================================================================================#
 
-from netCDF4 import Dataset                                          # read / write NetCDF4 files
 import matplotlib.pyplot as plt                                      # plotting library
-from datetime import datetime, timedelta                             # basic date and time types
 import numpy as np                                                   # import the Numpy package
+import sys                                                           # system-specific parameters and functions
+sys.path.append('../ancillary')                                      # add the ancillary folder to the module search path
+from timeseries import ndvi_time_series, write_table                 # pixel time series (only the bytes of the pixels are read)
+from readers import ndvi_date                                        # start date of the 10-day synthesis (file name)
+from cache import ProductCache                                       # local cache of script 13 (least recently used files are removed first)
 import os                                                            # miscellaneous operating system interfaces
-import glob                                                          # unix style pathname pattern expansion
 
 #-------------------------------------------------------------------------------------------------------------------
 
 # local directory
 local_dir = "samples_script_13"; os.makedirs(local_dir, exist_ok=True)
-files = sorted(glob.glob(f'{local_dir}/METOP_AVHRR_*_S10_AMs_NDV.img'), key=os.path.getmtime)
+# (the files are read through the cache of script 13, so they count as used for the eviction)
+files = sorted(ProductCache(local_dir).files('METOP_AVHRR_*_S10_AMs_V200.zip'), key=ndvi_date)
 print("\n".join(files))
 
-#-------------------------------------------------------------------------------------------------------------------
-
-# Create the lists that will store our data
-ndvi = []; dates = []
-
-for file in files:
-
-  #==================================================================================================================#
-  # DATA READING AND MANIPULATION
-  #==================================================================================================================#
-
-  print(f'Processing file: {file}')
-
-  # 1. open the image file ("flat binary" format)
-  file_name = file.rsplit('/', 1)[-1]
-  data = np.fromfile(file,dtype='uint8')
-
-  # 2. basic information from manual
-  nrow = 9072
-  ncol = 6720
-  min_lon = -93.0
-  min_lat = -56.0
-  max_lon = -33.0
-  max_lat =  25.0
-  res = (max_lon - min_lon) / ncol
-  fill_value = 255
-
-  # 3. geographic grid
-  lats = np.arange(min_lat+(res/2), max_lat-(res/2), res)
-  lons = np.arange(min_lon+(res/2), max_lon-(res/2), res)
-
-  # 4. convert to 2D array
-  data.shape=(nrow, ncol)
-
-  # 5. convert to float64 datatype
-  data = np.float64(data)
-
-  # 6. mask out the missing value
-  data[data > 250] = np.nan
-
-  # 7. apply scale and offset
-  data = - 0.08 + 0.004 * data
-
-  ############################
-  # DATA QUALITY FLAGS
-  ############################
-
-  # 8. open the data flag file
-  data_flag = np.fromfile(file.replace("NDV", "STM"),dtype='uint8')
-
-  # 9. convert to 2D array
-  data_flag.shape=(nrow, ncol)
-
-  # 10. get specific bit from byte array (clouds)
-  data_flag = (data_flag >> 1) & 1
-
-  # 12. apply the flag
-  data[data_flag == 1] = np.nan
-
-  ############################
-  # READ ONLY A REGION
-  ############################
-
-  # select the extent [min. lon, min. lat, max. lon, max. lat]
-  extent = [-50.0, -20.00, -33.00, 0.00] # Brazilian northeast
-
-  # latitude lower and upper index
-  latli = np.argmin( np.abs( lats - extent[1] ) )
-  latui = np.argmin( np.abs( lats - extent[3] ) )
-
-  # longitude lower and upper index
-  lonli = np.argmin( np.abs( lons - extent[0] ) )
-  lonui = np.argmin( np.abs( lons - extent[2] ) )
-
-  # extract the data
-  data = np.flipud(data)
-  data = data[ latli:latui , lonli:lonui ]
-
-  #==================================================================================================================#
-  # EXTRACTING PIXEL VALUES
-  #==================================================================================================================#
-
-  # reading lats and lons
-  lats = lats[latli:latui]
-  lons = lons[lonli:lonui]
-
-  # example with high NDVI
-  lat_point = -7.5
-  lon_point = -41.0
-
-  # example with missing data
-  #lat_point = -11.0
-  #lon_point = -41.5
+#==================================================================================================================#
+# EXTRACTING PIXEL VALUES
+#==================================================================================================================#
 
-  # calculate the indexes
-  lat_idx = np.argmin(np.abs(lats - lat_point))
-  lon_idx = np.argmin(np.abs(lons - lon_point))
+# example with high NDVI
+lat_point = -7.5
+lon_point = -41.0
 
-  # extract only the data for the desired region
-  data_point = data[ lat_idx , lon_idx ].round(2)
+# example with missing data
+#lat_point = -11.0
+#lon_point = -41.5
 
-  # add the data to the list
-  ndvi.append(data_point)
+# read only the bytes of the pixel from each archive (NDV value and STM cloud flag, see "../ancillary/timeseries.py").
+# the table has one row per date and point: time, point, lat, lon, value and quality flag (0 = valid, 1 = cloud, 2 = missing)
+table = ndvi_time_series(files, [(lat_point, lon_point)])
 
-  # get start the date from the file name
-  date_str = (file_name[file_name.find("AVHRR_")+6:file_name.find("_S10")])
-  date_format = '%Y%m%d'
-  date_start = datetime.strptime(date_str, date_format)
-  date_start_str = date_start.strftime('%Y-%m-%d')
+# save the table
+write_table(table, 'time_series_15.csv')
 
-  # add the date to the list
-  dates.append(date_start_str)
+# Create the lists with our data
+ndvi = [round(row['value'], 2) for row in table]
+dates = [row['time'].strftime('%Y-%m-%d') for row in table]
 
 #==================================================================================================================#
 # CREATE THE PLOT
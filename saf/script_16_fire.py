@@ -11,11 +11,13 @@ from netCDF4 import Dataset                                          # read / wr
 import matplotlib.pyplot as plt                                      # plotting library
 from datetime import datetime                                        # basic date and time types
 import cartopy, cartopy.crs as ccrs                                  # produce maps and other geospatial data analyses
-import cartopy.feature as cfeature                                   # common drawing and filtering operations
-import cartopy.io.shapereader as shpreader                           # import shapefiles
 import numpy as np                                                   # import the Numpy package
+import sys                                                           # system-specific parameters and functions
+sys.path.append('../ancillary')                                      # add the ancillary folder to the module search path
+from geometries import load_geometries                               # cached (simplified) geometries of the shapefiles
+from geometries import add_natural_earth                             # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
+from background import add_background                                # tiles of the background image, cropped to the extent
 import matplotlib                                                    # comprehensive library for creating visualizations in Python
-from matplotlib.image import imread                                  # read an image from a file into an array
 from matplotlib.offsetbox import AnchoredText                        # adds an anchored text box in the corner
 from matplotlib.offsetbox import OffsetImage                         # change the image size (zoom)
 from matplotlib.offsetbox import AnnotationBbox                      # creates an annotation using an OffsetBox
@@ -67,8 +69,8 @@ date_obj = datetime.strptime(date_str, date_format)
 date = date_obj.strftime('%Y-%m-%d %H:%M:%S UTC')
 
 # add a background map and night shade
-fname = '../ancillary/Nasa_land_ocean_ice_8192.jpg'
-ax.imshow(imread(fname), origin='upper', transform=ccrs.PlateCarree(), extent=[-180, 180, -90, 90], zorder=1)
+# (only the tiles of the extent, at the resolution of the figure)
+add_background(ax, extent, zorder=1)
 ax.add_feature(Nightshade(date_obj, alpha=0.5))
 
 # normalize bound values
@@ -79,12 +81,12 @@ norm = matplotlib.colors.BoundaryNorm(bounds, ncolors=256)
 img = ax.scatter(lons, lats, c=data, s=60, norm=norm, cmap=cmap, transform=ccrs.PlateCarree())
 
 # add a shapefile
-shapefile = list(shpreader.Reader('BR_UF_2022.shp').geometries())
+shapefile = load_geometries('BR_UF_2022.shp', extent)
 ax.add_geometries(shapefile, ccrs.PlateCarree(), edgecolor='white',facecolor='none', linewidth=0.3)
 
 # add coastlines, borders and gridlines
-ax.coastlines(resolution='50m', color='white', linewidth=0.8)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='white', linewidth=0.5)
+add_natural_earth(ax, 'coastline', extent, resolution='50m', edgecolor='white', linewidth=0.8)
+add_natural_earth(ax, 'borders', extent, edgecolor='white', linewidth=0.5)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='white', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 181, 5), ylocs=np.arange(-90, 91, 5), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False
@@ -11,9 +11,12 @@ from netCDF4 import Dataset                                          # read / wr
 import matplotlib.pyplot as plt                                      # plotting library
 from datetime import datetime                                        # basic date and time types
 import cartopy, cartopy.crs as ccrs                                  # produce maps and other geospatial data analyses
-import cartopy.feature as cfeature                                   # common drawing and filtering operations
-import cartopy.io.shapereader as shpreader                           # import shapefiles
 import numpy as np                                                   # import the Numpy package
+import sys                                                           # system-specific parameters and functions
+sys.path.append('../ancillary')                                      # add the ancillary folder to the module search path
+from readers import extent_to_slices                                 # regional slices of regular lat / lon grids
+from geometries import load_geometries                               # cached (simplified) geometries of the shapefiles
+from geometries import add_natural_earth                             # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 import matplotlib                                                    # comprehensive library for creating visualizations in Python
 from matplotlib.offsetbox import AnchoredText                        # adds an anchored text box in the corner
 from matplotlib.offsetbox import OffsetImage                         # change the image size (zoom)
@@ -30,20 +33,14 @@ file = Dataset(f'../samples/{file_name}')
 # select the extent [min. lon, min. lat, max. lon, max. lat]
 extent = [-80.0 + 360, -45.00, -30.00 + 360, 10.00]
 
-# reading lats and lons (whole image)
-lats = file.variables['lat'][:]
-lons = file.variables['lon'][:]
+# extent in longitudes from -180 to 180 (Natural Earth layers)
+lonlat_extent = [extent[0] - 360, extent[1], extent[2] - 360, extent[3]]
 
-# latitude lower and upper index
-latli = np.argmin( np.abs( lats - extent[1] ) )
-latui = np.argmin( np.abs( lats - extent[3] ) )
-
-# longitude lower and upper index
-lonli = np.argmin( np.abs( lons - extent[0] ) )
-lonui = np.argmin( np.abs( lons - extent[2] ) )
+# latitude and longitude slices of the extent (reads only the first and last coordinates)
+lat_slice, lon_slice = extent_to_slices(file, extent)
 
 # extract the data (based on the indexes)
-data = file.variables['var42'][0, latui:latli , lonli:lonui ]
+data = file.variables['var42'][ 0 , lat_slice , lon_slice ]
 
 #==================================================================================================================#
 # CREATE A CUSTOM COLOR SCALE
@@ -72,8 +69,8 @@ plt.figure(figsize=(8,9))
 ax = plt.axes(projection=ccrs.PlateCarree())
 
 # add some various map elements to the plot
-ax.add_feature(cfeature.LAND, facecolor='white')
-ax.add_feature(cfeature.OCEAN, facecolor='dimgray')
+add_natural_earth(ax, 'land', lonlat_extent, facecolor='white')
+add_natural_earth(ax, 'ocean', lonlat_extent, facecolor='dimgray')
 
 # define the image extent
 img_extent = [extent[0] - 360, extent[2] - 360, extent[1], extent[3]]
@@ -82,12 +79,12 @@ img_extent = [extent[0] - 360, extent[2] - 360, extent[1], extent[3]]
 img = ax.imshow(data, vmin=vmin, vmax=vmax, origin='upper', extent=img_extent, cmap=cmap)
 
 # add a shapefile
-shapefile = list(shpreader.Reader('BR_UF_2022.shp').geometries())
+shapefile = load_geometries('BR_UF_2022.shp', extent)
 ax.add_geometries(shapefile, ccrs.PlateCarree(), edgecolor='white',facecolor='none', linewidth=0.3)
 
 # add coastlines, borders and gridlines
-ax.coastlines(resolution='50m', color='white', linewidth=1.5)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='white', linewidth=1.0)
+add_natural_earth(ax, 'coastline', lonlat_extent, resolution='50m', edgecolor='white', linewidth=1.5)
+add_natural_earth(ax, 'borders', lonlat_extent, edgecolor='white', linewidth=1.0)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='white', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 180, 10), ylocs=np.arange(-90, 90, 10), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False
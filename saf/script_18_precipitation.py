@@ -11,8 +11,12 @@ from netCDF4 import Dataset                                          # read / wr
 import matplotlib.pyplot as plt                                      # plotting library
 from datetime import datetime                                        # basic date and time types
 import cartopy, cartopy.crs as ccrs                                  # produce maps and other geospatial data analyses
-import cartopy.io.shapereader as shpreader                           # import shapefiles
 import numpy as np                                                   # import the Numpy package
+import sys                                                           # system-specific parameters and functions
+sys.path.append('../ancillary')                                      # add the ancillary folder to the module search path
+from readers import extent_to_slices                                 # regional slices of regular lat / lon grids
+from geometries import load_geometries                               # cached (simplified) geometries of the shapefiles
+from geometries import add_natural_earth                             # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 import matplotlib                                                    # comprehensive library for creating visualizations in Python
 from matplotlib.offsetbox import AnchoredText                        # adds an anchored text box in the corner
 from matplotlib.offsetbox import OffsetImage                         # change the image size (zoom)
@@ -29,20 +33,11 @@ file = Dataset(f'../samples/{file_name}')
 # select the extent [min. lon, min. lat, max. lon, max. lat]
 extent = [-60.0, -20.00, -10.00, 20.00] # Brazilian northeast + atlantic
 
-# reading lats and lons (whole image)
-lats = file.variables['lat'][:]
-lons = file.variables['lon'][:]
-
-# latitude lower and upper index
-latli = np.argmin( np.abs( lats - extent[1] ) )
-latui = np.argmin( np.abs( lats - extent[3] ) )
-
-# longitude lower and upper index
-lonli = np.argmin( np.abs( lons - extent[0] ) )
-lonui = np.argmin( np.abs( lons - extent[2] ) )
+# latitude and longitude slices of the extent (reads only the first and last coordinates)
+lat_slice, lon_slice = extent_to_slices(file, extent)
 
 # extract the data (based on the indexes)
-data = file.variables['acc_rr'][ latli:latui , lonli:lonui ]
+data = file.variables['acc_rr'][ lat_slice , lon_slice ]
 
 #==================================================================================================================#
 # CREATE A CUSTOM COLOR SCALE
@@ -77,12 +72,12 @@ img_extent = [extent[0], extent[2], extent[1], extent[3]]
 img = ax.imshow(data, vmin=vmin, vmax=vmax, interpolation='bilinear', origin='lower', extent=img_extent, cmap=cmap)
 
 # add a shapefile
-shapefile = list(shpreader.Reader('BR_UF_2022.shp').geometries())
+shapefile = load_geometries('BR_UF_2022.shp', extent)
 ax.add_geometries(shapefile, ccrs.PlateCarree(), edgecolor='black',facecolor='none', linewidth=0.3)
 
 # add coastlines, borders and gridlines
-ax.coastlines(resolution='50m', color='black', linewidth=1.5)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='black', linewidth=1.0)
+add_natural_earth(ax, 'coastline', extent, resolution='50m', edgecolor='black', linewidth=1.5)
+add_natural_earth(ax, 'borders', extent, edgecolor='black', linewidth=1.0)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='white', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 180, 10), ylocs=np.arange(-90, 90, 10), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False
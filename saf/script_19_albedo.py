@@ -11,9 +11,12 @@ from netCDF4 import Dataset                                          # read / wr
 import matplotlib.pyplot as plt                                      # plotting library
 from datetime import datetime                                        # basic date and time types
 import cartopy, cartopy.crs as ccrs                                  # produce maps and other geospatial data analyses
-import cartopy.feature as cfeature                                   # common drawing and filtering operations
-import cartopy.io.shapereader as shpreader                           # import shapefiles
 import numpy as np                                                   # import the Numpy package
+import sys                                                           # system-specific parameters and functions
+sys.path.append('../ancillary')                                      # add the ancillary folder to the module search path
+from readers import extent_to_slices                                 # regional slices of regular lat / lon grids
+from geometries import load_geometries                               # cached (simplified) geometries of the shapefiles
+from geometries import add_natural_earth                             # cached Natural Earth layers (land, ocean, rivers, coastlines and borders)
 import matplotlib                                                    # comprehensive library for creating visualizations in Python
 from matplotlib.offsetbox import AnchoredText                        # adds an anchored text box in the corner
 from matplotlib.offsetbox import OffsetImage                         # change the image size (zoom)
@@ -29,20 +32,11 @@ file = Dataset("../samples/NETCDF4_LSASAF_M01-AVHR_ETAL_GLOBE_202307250000.nc")
 # select the extent [min. lon, min. lat, max. lon, max. lat]
 extent = [-75.0, -37.00, -33.00, 8.00] # Brazil
 
-# reading lats and lons (whole image)
-lats = file.variables['lat'][:]
-lons = file.variables['lon'][:]
-
-# latitude lower and upper index
-latli = np.argmin( np.abs( lats - extent[1] ) )
-latui = np.argmin( np.abs( lats - extent[3] ) )
-
-# longitude lower and upper index
-lonli = np.argmin( np.abs( lons - extent[0] ) )
-lonui = np.argmin( np.abs( lons - extent[2] ) )
+# latitude and longitude slices of the extent (reads only the first and last coordinates)
+lat_slice, lon_slice = extent_to_slices(file, extent)
 
 # extract the data (based on the indexes)
-data = file.variables['AL-BB-BH'][ 0 , latli:latui , lonli:lonui ]
+data = file.variables['AL-BB-BH'][ 0 , lat_slice , lon_slice ]
 
 #==================================================================================================================#
 # CREATE A CUSTOM COLOR SCALE
@@ -72,8 +66,8 @@ plt.figure(figsize=(8,9))
 ax = plt.axes(projection=ccrs.PlateCarree())
 
 # add some various map elements to the plot
-ax.add_feature(cfeature.LAND, facecolor='white')
-ax.add_feature(cfeature.OCEAN, facecolor='dimgray')
+add_natural_earth(ax, 'land', extent, facecolor='white')
+add_natural_earth(ax, 'ocean', extent, facecolor='dimgray')
 
 # define the image extent
 img_extent = [extent[0], extent[2], extent[1], extent[3]]
@@ -82,12 +76,12 @@ img_extent = [extent[0], extent[2], extent[1], extent[3]]
 img = ax.imshow(data, vmin=vmin, vmax=vmax, origin='lower', extent=img_extent, cmap=cmap)
 
 # add a shapefile
-shapefile = list(shpreader.Reader('BR_UF_2022.shp').geometries())
+shapefile = load_geometries('BR_UF_2022.shp', extent)
 ax.add_geometries(shapefile, ccrs.PlateCarree(), edgecolor='lightgray',facecolor='none', linewidth=0.3)
 
 # add coastlines, borders and gridlines
-ax.coastlines(resolution='50m', color='white', linewidth=0.8)
-ax.add_feature(cartopy.feature.BORDERS, edgecolor='white', linewidth=0.5)
+add_natural_earth(ax, 'coastline', extent, resolution='50m', edgecolor='white', linewidth=0.8)
+add_natural_earth(ax, 'borders', extent, edgecolor='white', linewidth=0.5)
 gl = ax.gridlines(crs=ccrs.PlateCarree(), color='white', alpha=1.0, linestyle='--', linewidth=0.25, xlocs=np.arange(-180, 181, 5), ylocs=np.arange(-90, 91, 5), draw_labels=True)
 gl.top_labels = False
 gl.right_labels = False